@@ -0,0 +1,16 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import sys
+
+_GRAPH_NAMES = ('Grapher', 'asciigraph', 'asciihist', 'asciibraille', 'asciidist', 'render_to')
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ needs Python 3.7, older versions import asciietch.graph up front
+    from asciietch.graph import Grapher, asciibraille, asciidist, asciigraph, asciihist, render_to  # noqa: F401
+else:
+    def __getattr__(name):
+        # asciietch.graph is only imported when one of its names is used, so importing another module stays cheap
+        if name in _GRAPH_NAMES:
+            from asciietch import graph
+            return getattr(graph, name)
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,321 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Downsampling strategies used to fit a series into the width of a graph.
+
+Each strategy reduces a series in one pass: the column reducers consume every column straight off an iterator,
+'minmax' keeps the lowest and highest value of every pair of columns in the order they occurred, and 'lttb'
+(Largest-Triangle-Three-Buckets) keeps the point of each column that best preserves the shape of the line.
+"""
+import math
+from collections import deque
+from itertools import islice, repeat
+from operator import mul, sub
+
+DEFAULT_AGGREGATE = 'mean'
+# How time columns without values are drawn: at 0, left blank, or at the value of the previous column
+GAP_MODES = ('zero', 'blank', 'carry')
+
+
+def _mean(column, count):
+    return sum(column) / count
+
+
+def _min(column, count):
+    return min(column)
+
+
+def _max(column, count):
+    return max(column)
+
+
+def _last(column, count):
+    return deque(column, maxlen=1)[0]
+
+
+def _minmax(column, count):
+    '''Return the lowest and highest value of the column, in the order they occurred'''
+    column = list(column)
+    low = min(column)
+    high = max(column)
+    if column.index(low) <= column.index(high):
+        return low, high
+    return high, low
+
+
+COLUMN_REDUCERS = {
+    'mean': _mean,
+    'min': _min,
+    'max': _max,
+    'last': _last,
+    'minmax': _minmax,
+}
+AGGREGATES = tuple(COLUMN_REDUCERS) + ('lttb',)
+
+
+def resolve_aggregate(aggregate, max_width):
+    '''Validate the aggregate, and pick max instead of minmax when there's no room for two values'''
+    if aggregate not in AGGREGATES:
+        raise ValueError(f'Unknown aggregate {aggregate!r}, expected one of {AGGREGATES}')
+    if aggregate == 'minmax' and max_width < 2:
+        return 'max'
+    return aggregate
+
+
+def get_column_count(max_width, aggregate):
+    '''Number of columns to bin the values into, minmax emits two values per column'''
+    if aggregate == 'minmax':
+        return max_width // 2
+    return max_width
+
+
+def downsample(values, max_width, aggregate=DEFAULT_AGGREGATE, stats=None, skip_nan=False):
+    '''Reduce a sequence of more than max_width values to at most max_width values, see reduce_runs for stats and skip_nan'''
+    if aggregate == 'lttb':
+        if stats is not None:
+            stats.update(values)
+        return lttb(range(len(values)), values, max_width)
+
+    column_count = get_column_count(max_width, aggregate)
+    positions = [len(values) * i // column_count for i in range(column_count + 1)]
+    return reduce_runs(values, map(sub, positions[1:], positions), aggregate, stats, skip_nan=skip_nan)
+
+
+def reduce_runs(values, counts, aggregate=DEFAULT_AGGREGATE, stats=None, empty=0, skip_nan=False):
+    '''Reduce consecutive runs of values with the aggregate, consuming runs of the given counts off one iterator
+
+    Empty runs are reduced to empty. When a RunningStats is given, every run is added to it on the way through, so the
+    statistics of the whole series are gathered in the same pass. With skip_nan, NaN values are left out of their run,
+    which is reduced to empty if it holds nothing else.
+    '''
+    reducer = COLUMN_REDUCERS[aggregate]
+    iterator = iter(values)
+    if skip_nan:
+        def reduce_run(count):
+            run = list(islice(iterator, count))
+            total = sum(run)
+            if total != total:  # Only a NaN, or infinities of both signs, make the sum NaN
+                run = [value for value in run if value == value]
+                if not run:
+                    return (empty, empty) if aggregate == 'minmax' else empty
+            elif aggregate == 'mean' and stats is None:
+                return total / len(run)
+            if stats is not None:
+                stats.add_chunk(run)
+            return reducer(run, len(run))
+    elif stats is None:
+        def reduce_run(count):
+            return reducer(islice(iterator, count), count)
+    else:
+        def reduce_run(count):
+            run = list(islice(iterator, count))
+            stats.add_chunk(run)
+            return reducer(run, count)
+
+    if aggregate == 'minmax':
+        return [value for count in counts for value in (reduce_run(count) if count else (empty, empty))]
+    return [reduce_run(count) if count else empty for count in counts]
+
+
+def fill_gaps(columns, gaps):
+    '''Fill the empty columns, marked None, the way the gap mode says, see GAP_MODES
+
+    Blank gaps are left as None, carried gaps take the value of the previous column. Gaps before the first value
+    have nothing to carry and stay blank.
+    '''
+    if gaps not in GAP_MODES:
+        raise ValueError(f'Unknown gap mode {gaps!r}, expected one of {GAP_MODES}')
+    if gaps == 'zero':
+        return [0 if value is None else value for value in columns]
+    if gaps == 'carry':
+        previous = None
+        filled = []
+        for value in columns:
+            if value is None:
+                value = previous
+            filled.append(value)
+            previous = value
+        return filled
+    return columns
+
+
+def downsample_stream(values, length, max_width, aggregate=DEFAULT_AGGREGATE, stats=None, chunksize=65536):
+    '''Reduce an iterable of about length values to at most max_width values, holding at most chunksize values at a time
+
+    Columns are laid out by position in the iterable, so None values are skipped within their column. Columns left
+    empty because the iterable ran out early are dropped, and values beyond length go into the last column. Every
+    value is added to stats, a RunningStats, when one is given. lttb needs random access and isn't supported.
+    '''
+    column_count = get_column_count(max_width, aggregate)
+    positions = [length * i // column_count for i in range(column_count + 1)]
+    counts = list(map(sub, positions[1:], positions))
+    counts[-1] = None  # The last column takes whatever is left
+
+    iterator = iter(values)
+    adjusted_values = []
+    for count in counts:
+        reduced = _reduce_stream_run(iterator, count, aggregate, stats, chunksize)
+        if reduced is None:
+            if count is None or count:
+                break  # The iterable ran out
+            reduced = (0, 0) if aggregate == 'minmax' else 0
+        if aggregate == 'minmax':
+            adjusted_values.extend(reduced)
+        else:
+            adjusted_values.append(reduced)
+    return adjusted_values
+
+
+def _reduce_stream_run(iterator, count, aggregate, stats, chunksize):
+    '''Reduce the next count values of the iterator, or all that are left if count is None, None if there were none'''
+    run = RunningStats()
+    last = None
+    low_position = high_position = position = 0
+    remaining = count
+    while remaining is None or remaining > 0:
+        chunk = list(islice(iterator, chunksize if remaining is None else min(remaining, chunksize)))
+        if not chunk:
+            break
+        if remaining is not None:
+            remaining -= len(chunk)
+        if None in chunk:
+            chunk = [value for value in chunk if value is not None]
+            if not chunk:
+                continue
+        if aggregate == 'minmax':
+            low = min(chunk)
+            high = max(chunk)
+            if run.low is None or low < run.low:
+                low_position = position + chunk.index(low)
+            if run.high is None or high > run.high:
+                high_position = position + chunk.index(high)
+        run.add_chunk(chunk)
+        last = chunk[-1]
+        position += len(chunk)
+
+    if not run.count:
+        return None
+    if stats is not None:
+        stats.merge(run)
+    if aggregate == 'mean':
+        return run.mean
+    if aggregate == 'min':
+        return run.low
+    if aggregate == 'max':
+        return run.high
+    if aggregate == 'last':
+        return last
+    return (run.low, run.high) if low_position <= high_position else (run.high, run.low)
+
+
+class RunningStats(object):
+    """Count, mean, sample variance, min and max of a stream of values, gathered in a single pass.
+
+    Single values are added with Welford's algorithm. Chunks of values are summarised with a two-pass variance over
+    the chunk and merged in with Chan's parallel algorithm, which keeps the per-value work in C. Iterables are
+    consumed once, in chunks.
+    """
+    __slots__ = ('count', 'mean', 'm2', 'low', 'high')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean
+        self.low = None
+        self.high = None
+
+    def add(self, value):
+        '''Add a single value'''
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+
+    def add_chunk(self, chunk):
+        '''Add a list of values'''
+        count = len(chunk)
+        if not count:
+            return
+        mean = sum(chunk) / count
+        deviations = list(map(sub, chunk, repeat(mean)))
+        m2 = sum(map(mul, deviations, deviations))
+        self.add_summary(count, mean, m2, min(chunk), max(chunk))
+
+    def add_summary(self, count, mean, m2, low, high):
+        '''Merge in the statistics of another group of values'''
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.low = low if self.low is None else min(self.low, low)
+        self.high = high if self.high is None else max(self.high, high)
+
+    def merge(self, other):
+        '''Merge in the statistics gathered by another RunningStats'''
+        self.add_summary(other.count, other.mean, other.m2, other.low, other.high)
+
+    def update(self, values, chunksize=4096):
+        '''Add every value of an iterable, iterating over it only once'''
+        iterator = iter(values)
+        chunk = list(islice(iterator, chunksize))
+        while chunk:
+            self.add_chunk(chunk)
+            chunk = list(islice(iterator, chunksize))
+
+    @property
+    def variance(self):
+        '''Sample variance, like statistics.variance'''
+        if self.count < 2:
+            import statistics
+            raise statistics.StatisticsError('variance requires at least two data points')
+        return self.m2 / (self.count - 1)
+
+    @property
+    def stdev(self):
+        '''Sample standard deviation, like statistics.stdev'''
+        return math.sqrt(self.variance)
+
+
+def lttb(x_values, y_values, max_width):
+    '''Select max_width points with Largest-Triangle-Three-Buckets and return their y values
+
+    The first and last points are always kept. The points in between are split into max_width - 2 buckets, and
+    from each bucket the point forming the largest triangle with the point kept from the previous bucket and
+    the average of the next bucket is kept.
+    '''
+    length = len(y_values)
+    if length <= max_width:
+        return list(y_values)
+    if max_width < 3:
+        return [y_values[0], y_values[-1]][:max_width]
+
+    bucket_size = (length - 2) / (max_width - 2)
+    sampled = [y_values[0]]
+    previous = 0
+    for i in range(max_width - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, length)
+
+        next_count = next_end - end
+        next_x = sum(x_values[end:next_end]) / next_count
+        next_y = sum(y_values[end:next_end]) / next_count
+
+        previous_x = x_values[previous]
+        previous_y = y_values[previous]
+        largest_area = -1
+        for j in range(start, end):
+            # Twice the triangle area, the constant factor doesn't change which point is largest
+            area = abs((previous_x - next_x) * (y_values[j] - previous_y) - (previous_x - x_values[j]) * (next_y - previous_y))
+            if area > largest_area:
+                largest_area = area
+                previous = j
+        sampled.append(y_values[previous])
+    sampled.append(y_values[-1])
+    return sampled
@@ -0,0 +1,100 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _fingerprint(values):
+    '''Fingerprint one series, None if it can't be fingerprinted without consuming it'''
+    if values is None:
+        return ()
+    if isinstance(values, range):
+        return ('range', values.start, values.stop, values.step)
+    if isinstance(values, (list, tuple, dict)):
+        # Digest of the pickle, which encodes every value with its type in one pass in C, so keys stay small and cheap to
+        # compare. Equal series pickled differently, such as ones sharing string objects, only miss the cache.
+        try:
+            data = pickle.dumps(values, protocol=4)
+        except (pickle.PickleError, TypeError, AttributeError):
+            return None
+        return (type(values).__name__, len(values), _digest(data))
+    if hasattr(values, 'tobytes'):
+        # Buffers such as array.array, memoryview and NumPy arrays are hashed by their contents and layout
+        layout = (type(values).__name__, str(getattr(values, 'dtype', None) or getattr(values, 'typecode', None) or getattr(values, 'format', None)),
+                  getattr(values, 'shape', None) or len(values))
+        return layout + (_digest(values.tobytes()),)
+    return None
+
+
+def fingerprint(values, timestamps=None):
+    '''Return a hashable fingerprint of a series and its timestamps
+
+    Returns None for iterators and other inputs that can't be fingerprinted without consuming them, or that hold
+    values that can't be pickled.
+    '''
+    try:
+        values_fingerprint = _fingerprint(values)
+        timestamps_fingerprint = _fingerprint(timestamps)
+    except TypeError:
+        return None
+    if values_fingerprint is None or timestamps_fingerprint is None:
+        return None
+    return values_fingerprint, timestamps_fingerprint
+
+
+class RenderCache(object):
+    """A thread safe LRU cache of renders, with an optional time to live.
+
+    Pass one to Grapher to cache asciigraph and asciihist results, keyed on a fingerprint of the series plus the
+    render options. The downsampled columns are cached as well, so rendering a cached series at a different
+    max_height skips the X scaling. hits and misses count lookups of both.
+    """
+
+    def __init__(self, maxsize=128, ttl=None, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        '''Return the cached value for the key, or None if it isn't cached or expired'''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > self.timer():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        '''Cache a value, evicting the least recently used entries beyond maxsize'''
+        expires = None if self.ttl is None else self.timer() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        '''Empty the cache and reset the counters'''
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
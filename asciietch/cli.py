@@ -0,0 +1,197 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""The asciietch command.
+
+Reads one number per line, or a "timestamp value" pair per line, from files or stdin and graphs them. Blank lines
+and lines starting with # are skipped. With --follow the graph is redrawn in place at a fixed frame rate while
+values arrive, each value only updates the newest column of a StreamingGrapher so history is never re-parsed.
+"""
+import argparse
+import sys
+import time
+from array import array
+
+from asciietch.aggregate import AGGREGATES, DEFAULT_AGGREGATE, GAP_MODES
+from asciietch.graph import asciidist, render_to
+
+CHUNK_BYTES = 1 << 16
+_CURSOR_UP = '\x1b[{}F'
+_CLEAR_TO_END = '\x1b[J'
+
+
+def parse_lines(lines, values, timestamps):
+    '''Parse lines of values or timestamp value pairs, appending to the values and timestamps arrays'''
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        try:
+            if len(fields) == 1:
+                values.append(float(fields[0]))
+                continue
+            if len(fields) == 2:
+                timestamp, value = float(fields[0]), float(fields[1])
+                timestamps.append(timestamp)
+                values.append(value)
+                continue
+        except ValueError:
+            pass
+        raise ValueError(f'Could not parse line {line.rstrip()!r}, expected a value or a timestamp and a value')
+
+
+def read_series(streams, chunk_bytes=CHUNK_BYTES):
+    '''Read all the values and timestamps of the streams, about chunk_bytes of lines at a time'''
+    values = array('d')
+    timestamps = array('d')
+    for stream in streams:
+        lines = stream.readlines(chunk_bytes)
+        while lines:
+            parse_lines(lines, values, timestamps)
+            lines = stream.readlines(chunk_bytes)
+    if timestamps and len(timestamps) != len(values):
+        raise ValueError('Lines with and without timestamps are mixed')
+    return values, timestamps or None
+
+
+def format_rate(count, seconds):
+    '''Describe how many values were read and how fast'''
+    rate = count / seconds if seconds > 0 else 0.0
+    return f'{count} values in {seconds:.2f}s ({rate:,.0f} values/s)'
+
+
+class _Follower(object):
+    '''Read lines on a thread and hand them to the main thread in batches'''
+
+    def __init__(self, streams):
+        import threading
+
+        self.streams = streams
+        self.error = None
+        self.done = threading.Event()
+        self._lines = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._read, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _read(self):
+        try:
+            for stream in self.streams:
+                for line in stream:
+                    with self._lock:
+                        self._lines.append(line)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+    def take(self):
+        '''Return the lines read since the last call'''
+        with self._lock:
+            lines, self._lines = self._lines, []
+        return lines
+
+
+def follow(streams, output, args):
+    '''Redraw the graph in place at args.fps frames per second until the streams are exhausted'''
+    from asciietch.stream import StreamingGrapher
+
+    grapher = StreamingGrapher(max_width=args.width, max_height=args.height, points_per_column=args.points_per_column,
+                               seconds_per_column=args.seconds_per_column, aggregate=args.aggregate)
+    follower = _Follower(streams)
+    count = 0
+    start = time.perf_counter()
+    follower.start()
+    frame_lines = 0
+    while True:
+        finished = follower.done.wait(1 / args.fps)
+        values = array('d')
+        timestamps = array('d')
+        parse_lines(follower.take(), values, timestamps)
+        if timestamps and len(timestamps) != len(values):
+            raise ValueError('Lines with and without timestamps are mixed')
+        grapher.extend(values, timestamps or None)
+        count += len(values)
+
+        frame = grapher.render(label=args.label) if len(grapher) else ''
+        frame += '\n' + format_rate(count, time.perf_counter() - start)
+        if frame_lines:
+            output.write(_CURSOR_UP.format(frame_lines))
+        output.write(_CLEAR_TO_END + frame + '\n')
+        output.flush()
+        frame_lines = frame.count('\n') + 1
+        if finished:
+            break
+    if follower.error is not None:
+        raise follower.error
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog='asciietch', description='Graph numbers, or "timestamp value" pairs, read one per line.')
+    parser.add_argument('files', nargs='*', type=argparse.FileType('r'), help='files to read, stdin if none are given')
+    parser.add_argument('--height', type=int, help='maximum height of the graph')
+    parser.add_argument('--width', type=int, help='maximum width of the graph')
+    parser.add_argument('--label', action='store_true', help='surround the graph with a label')
+    parser.add_argument('--hist', action='store_true', help='draw a one line histogram instead of a graph')
+    parser.add_argument('--dist', choices=('linear', 'log'), help='draw a histogram of the distribution of the values, on this scale')
+    parser.add_argument('--braille', action='store_true', help='draw the graph with Braille dots, two values per character')
+    parser.add_argument('--aggregate', choices=AGGREGATES, default=DEFAULT_AGGREGATE, help='how the values of a column are combined')
+    parser.add_argument('--gaps', choices=GAP_MODES, default='zero', help='how time columns without values are drawn')
+    parser.add_argument('--rate', action='store_true', help='report how fast values were read on stderr')
+    parser.add_argument('--follow', action='store_true', help='redraw the graph in place as values arrive')
+    parser.add_argument('--fps', type=float, default=4, help='frames per second with --follow')
+    parser.add_argument('--points-per-column', type=int, default=1, help='values per column with --follow')
+    parser.add_argument('--seconds-per-column', type=float, help='seconds per column with --follow, by timestamp or arrival time')
+    return parser
+
+
+def main(argv=None, stdin=None, stdout=None):
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    streams = args.files or [stdin or sys.stdin]
+    output = stdout or sys.stdout
+    if args.follow:
+        from asciietch.stream import STREAMING_AGGREGATES
+        if args.aggregate not in STREAMING_AGGREGATES:
+            parser.error(f'--follow supports the aggregates {", ".join(STREAMING_AGGREGATES)}')
+        unsupported = [option for option, used in (('--hist', args.hist), ('--braille', args.braille), ('--dist', args.dist),
+                                                   ('--gaps', args.gaps != 'zero'), ('--rate', args.rate)) if used]
+        if unsupported:
+            parser.error(f'--follow can\'t be combined with {", ".join(unsupported)}')
+
+    try:
+        if args.follow:
+            follow(streams, output, args)
+            return 0
+        start = time.perf_counter()
+        values, timestamps = read_series(streams)
+        if args.rate:
+            print(format_rate(len(values), time.perf_counter() - start), file=sys.stderr)
+        if not values:
+            print('asciietch: no values read', file=sys.stderr)
+            return 1
+        if args.dist:
+            print(asciidist(values, max_width=args.width, label=args.label, scale=args.dist), file=output)
+            return 0
+        options = {'label': args.label, 'aggregate': args.aggregate, 'timestamps': timestamps, 'gaps': args.gaps}
+        # Rows are written as they are drawn
+        if args.hist:
+            render_to(output, values, method='asciihist', max_width=args.width, **options)
+        else:
+            render_to(output, values, method='asciibraille' if args.braille else 'asciigraph', max_height=args.height, max_width=args.width,
+                      **options)
+        output.write('\n')
+    except ValueError as e:
+        print(f'asciietch: {e}', file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        for stream in args.files:
+            stream.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,51 +1,296 @@
 #!/usr/bin/env python
 # Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
 # See LICENSE in the project root for license information.
-import random
-import statistics
-from datetime import datetime
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque, namedtuple
+from collections.abc import Sequence
+from itertools import compress, islice
+from operator import itemgetter, le, length_hint, sub
+
+from asciietch.aggregate import (DEFAULT_AGGREGATE, GAP_MODES, RunningStats, downsample, downsample_stream, fill_gaps, get_column_count, lttb, reduce_runs,
+                                 resolve_aggregate)
 
 BORDER_FILL_CHARACTER = '*'
+_VERTICAL_FILL = b'|'
+# Character of a point, indexed by _get_slope_index
+_SLOPE_CHARACTERS = '--/--/\\\\-'
+_SLOPE_CODES = _SLOPE_CHARACTERS.encode('ascii')
+_GAP = -1  # Height of a column without values, drawn blank
 DEFAULT_MAX_WIDTH = 180
+HISTOGRAM_BARS = ('▁', '▂', '▃', '▄', '▅', '▆', '▇', '█')
+BACKENDS = (None, 'python', 'numpy')
+OVERLAY_GLYPHS = ('*', '+', 'o', 'x', '#', '@', '%', '&')
+RENDER_METHODS = ('asciigraph', 'asciihist', 'asciibraille')
+
+# Braille cells hold 2x4 dots, _BRAILLE_DOTS[row][column] is the bit of a dot counting rows from the top
+_BRAILLE_DOTS = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+# _BRAILLE_SPANS[column][top][bottom] sets the dots from row top down to row bottom of a cell column
+_BRAILLE_SPANS = tuple(tuple(tuple(sum(_BRAILLE_DOTS[row][column] for row in range(top, bottom + 1)) for bottom in range(4))
+                             for top in range(4)) for column in range(2))
+# Maps a byte of dot bits to its Braille character, Unicode encodes the dots as bits above U+2800
+_BRAILLE_CHARACTERS = {bits: 0x2800 + bits for bits in range(256)}
+
+
+def _get_slope_index(y_prev, y, y_next):
+    '''Index of the character of the point y in _SLOPE_CHARACTERS: 3 * sign(y_prev - y) + sign(y_next - y) + 4'''
+    return 3 * ((y_prev > y) - (y_prev < y)) + (y_next > y) - (y_next < y) + 4
+
+
+def _is_ndarray(values):
+    '''Check for a NumPy array without importing NumPy, values can only be an array if NumPy is already imported'''
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def _has_columns(values):
+    '''Summaries such as a SeriesPyramid scale themselves, with get_columns(max_width, aggregate, label, gaps)
+
+    Summaries that can be windowed also have zoom(start, end), where None keeps their own start or end.
+    '''
+    return hasattr(values, 'get_columns')
+
+
+def _find_column_start(timestamps, first_timestamp, step_size, column, low):
+    '''Binary search sorted timestamps, from index low, for the first one that falls into the column'''
+    high = len(timestamps)
+    if not step_size:
+        return high  # All timestamps are the same, everything goes into the first column
+    while low < high:
+        middle = (low + high) // 2
+        if (timestamps[middle] - first_timestamp) // step_size < column:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _may_hold_none(values):
+    '''Arrays and memoryviews can't hold None, other sequences are searched'''
+    return not isinstance(values, (array, memoryview, range)) and None in values
+
+
+def _is_float_buffer(values):
+    '''Float arrays and memoryviews, such as memory-mapped series, mark missing values with NaN'''
+    if isinstance(values, array):
+        return values.typecode in ('f', 'd')
+    return isinstance(values, memoryview) and values.format in ('f', 'd')
+
+
+def _is_overlay(values):
+    '''Several series are given as a list or tuple of sequences, timeseries dictionaries or NumPy arrays'''
+    return isinstance(values, (list, tuple)) and bool(values) and (isinstance(values[0], (Sequence, dict)) or _is_ndarray(values[0]))
+
+
+def _get_window(timestamps, start, end):
+    '''The time window from start to end of sorted timestamps, a missing bound defaults to the first or last timestamp
+    within the window, or to the other bound when the window holds none'''
+    if start is not None and end is not None and start > end:
+        raise ValueError(f'The time window must not end before it starts, not {start!r} to {end!r}')
+    if start is None:
+        start = timestamps[0] if len(timestamps) and (end is None or timestamps[0] <= end) else end
+    if end is None:
+        end = timestamps[-1] if len(timestamps) and timestamps[-1] >= start else start
+    return start, end
+
+
+def _format_label_value(value):
+    '''Format a statistic of the label, n/a for the missing statistics of an empty time window'''
+    return 'n/a' if value is None else f'{value:.2f}'
+
+
+def _get_time_counts(timestamps, first_timestamp, step_size, column_count):
+    '''Count the sorted timestamps falling into each of column_count columns of step_size seconds'''
+    column_starts = [0]
+    for column in range(1, column_count):
+        column_starts.append(_find_column_start(timestamps, first_timestamp, step_size, column, column_starts[-1]))
+    column_starts.append(len(timestamps))  # Don't go beyond the last column
+    return list(map(sub, column_starts[1:], column_starts))
+
+
+def _is_sorted(values):
+    return all(map(le, values, islice(values, 1, None)))
+
+
+def _render_chunk(grapher_class, method, chunk, options):
+    '''Render a chunk of series in a worker process'''
+    render = getattr(grapher_class(), method)
+    return [render(values, **options) for values in chunk]
+
+
+async def _collect_samples(samples):
+    '''Read an async iterable of values, or of (timestamp, value) pairs, into values and timestamps'''
+    values = []
+    timestamps = []
+    async for sample in samples:
+        if isinstance(sample, (tuple, list)):
+            timestamp, sample = sample
+            timestamps.append(timestamp)
+        values.append(sample)
+    if timestamps and len(timestamps) != len(values):
+        raise ValueError('Samples with and without timestamps are mixed')
+    return values, timestamps or None
+
+
+def _render_size(values):
+    '''Number of values to render, None when it isn't known without consuming them'''
+    if _is_overlay(values):
+        return sum(len(series) for series in values)
+    return len(values) if hasattr(values, '__len__') else None
+
+
+def _numpy_backend():
+    from asciietch import numpy_backend
+    return numpy_backend
+
+
+# A series scaled to the width of a graph, with the numbers needed to label it. max_value is the largest value before
+# X scaling, used for the default max_height. stdev and mean are only filled in for labelled graphs.
+Columns = namedtuple('Columns', ['values', 'upper_value', 'lower_value', 'max_value', 'stdev', 'mean', 'start_ctime', 'end_ctime'])
+
+
+def _get_window_columns(adjusted_values, start, end, gaps='zero', stats=None):
+    '''Columns of a summary of the time window from start to end, filling empty columns (None) according to gaps
+
+    The labels are taken from stats, the RunningStats of the whole window, when given and the window isn't empty.
+    '''
+    adjusted_values = fill_gaps(adjusted_values, gaps)
+    start_ctime, end_ctime = Grapher()._get_start_and_end_ctimes((start, end))
+    max_value = max((value for value in adjusted_values if value is not None), default=0)
+    if stats is None or not stats.count:
+        return Columns(adjusted_values, None, None, max_value, None, None, start_ctime, end_ctime)
+    return Columns(adjusted_values, stats.high, stats.low, max_value, stats.stdev, stats.mean, start_ctime, end_ctime)
 
 
 class Grapher(object):
+    cache = None
+    instrument = None
+    # Async renders of at most this many values run on the event loop, larger ones in an executor
+    inline_render_size = 10000
+    max_concurrent_renders = 4
+    _render_semaphore = None  # The event loop and the semaphore limiting the renders running in executors
 
-    def _scale_x_values(self, values, max_width):
-        '''Scale X values to new width'''
-        adjusted_values = list(values)
-        if len(adjusted_values) > max_width:
+    def __init__(self, cache=None, instrument=None):
+        '''Pass a RenderCache to cache renders of series that were rendered before with the same options
 
-            def get_position(current_pos):
-                return len(adjusted_values) * current_pos // max_width
+        Pass an instrument, such as an asciietch.instrument.StageRecorder, to measure every stage of the renders.
+        '''
+        self.cache = cache
+        self.instrument = instrument
 
-            adjusted_values = [statistics.mean(adjusted_values[get_position(i):get_position(i + 1)]) for i in range(max_width)]
+    def _run_stage(self, stage, func, values, *args, **kwargs):
+        '''Run one stage of the pipeline, through the instrument when there is one'''
+        if self.instrument is None:
+            return func(values, *args, **kwargs)
+        return self.instrument.run(stage, func, values, *args, **kwargs)
 
-        return adjusted_values
+    def instrumented(self, callback=None, trace_memory=False):
+        '''Record the stages of the renders made within a with block, which gets the StageRecorder
+
+        callback is called with every StageTiming as it is recorded, see asciietch.instrument.
+        '''
+        from asciietch.instrument import StageRecorder, instrumented
 
-    def _scale_x_values_timestamps(self, values, max_width):
-        '''Scale X values to new width based on timestamps'''
-        first_timestamp = float(values[0][0])
-        last_timestamp = float(values[-1][0])
-        step_size = (last_timestamp - first_timestamp) / max_width
+        return instrumented(self, StageRecorder(callback=callback, trace_memory=trace_memory))
 
-        values_by_column = [[] for _ in range(max_width)]
-        for timestamp, value in values:
-            if value is None:
-                continue
-            timestamp = float(timestamp)
-            column = (timestamp - first_timestamp) // step_size
-            column = int(min(column, max_width - 1))  # Don't go beyond the last column
-            values_by_column[column].append(value)
+    def compile(self, max_width=None, max_height=None, label=False, method='asciigraph', **options):
+        '''Return a RenderTemplate drawing series like method does with these settings, for rendering many of them
+
+        options are the aggregate, backend and gaps, see asciietch.template.
+        '''
+        from asciietch.template import RenderTemplate
 
-        adjusted_values = [statistics.mean(values) if values else 0 for values in values_by_column]  # Average each column, 0 if no values
+        return RenderTemplate(self, method, max_width, max_height, label, **options)
 
-        return adjusted_values
+    def _scale_x_values(self, values, max_width, aggregate=DEFAULT_AGGREGATE, stats=None, length=None):
+        '''Scale X values to new width
+
+        Reduces each column with the aggregate in a single pass over the values, consuming consecutive runs straight off an
+        iterator instead of copying out a slice per column. See asciietch.aggregate for the available aggregates.
+        Every value is also added to stats, a RunningStats, when one is given.
+        Iterators whose length is given, or hinted through __length_hint__, are downsampled as they are consumed, holding
+        only a chunk of values at a time and skipping None values. Other iterators are read into a list first.
+        NaN values of float arrays and memoryviews are skipped within their column, without copying the buffer.
+        '''
+        aggregate = resolve_aggregate(aggregate, max_width)
+        if _is_ndarray(values):
+            return _numpy_backend().scale_x_values(values, max_width, aggregate, stats)
+        if not isinstance(values, Sequence):
+            length = length or length_hint(values)
+            if length > max_width and aggregate != 'lttb':
+                return downsample_stream(values, length, max_width, aggregate, stats)
+            values = [value for value in values if value is not None]
+        if _is_float_buffer(values):
+            if len(values) > max_width and aggregate != 'lttb':
+                return downsample(values, max_width, aggregate, stats, skip_nan=True)
+            values = [value for value in values if value == value]
+        if len(values) <= max_width:
+            if stats is not None:
+                stats.update(values)
+            return list(values)
+        return downsample(values, max_width, aggregate, stats)
+
+    def _scale_x_values_timestamps(self, values, max_width, aggregate=DEFAULT_AGGREGATE, timestamps=None, stats=None, gaps='zero', start=None,
+                                   end=None):
+        '''Scale X values to new width based on timestamps
+
+        Values are (timestamp, value) pairs sorted by timestamp, or a sequence of values when their sorted timestamps are
+        given separately. Because the timestamps are sorted every column is a consecutive run of values: the start of
+        each column is found with a binary search, and the runs are reduced in one pass like _scale_x_values does,
+        adding every value to stats if given.
+        Columns without values are filled according to gaps, see asciietch.aggregate.GAP_MODES, blank columns are None.
+        The columns span the time window from start to end, which defaults to the first and last timestamps, and values
+        outside of it are left out. The columns of a window without values are all gaps.
+        '''
+        aggregate = resolve_aggregate(aggregate, max_width)
+        if timestamps is None:
+            if _is_ndarray(values):
+                timestamps, values = values[:, 0], values[:, 1]
+            else:
+                timestamps = [timestamp for timestamp, _ in values]
+                values = [value for _, value in values]
+        if _is_ndarray(values) or _is_ndarray(timestamps):
+            if gaps == 'zero' and start is None and end is None:
+                return _numpy_backend().scale_x_values_timestamps(timestamps, values, max_width, aggregate, stats)
+            timestamps, values = self._prepare_values(timestamps, 'python'), self._prepare_values(values, 'python')
+
+        if isinstance(timestamps[0], str):
+            timestamps = list(map(float, timestamps))
+        if start is not None or end is not None:
+            first = 0 if start is None else bisect_left(timestamps, start)
+            stop = len(timestamps) if end is None else bisect_right(timestamps, end)
+            timestamps = timestamps[first:stop]
+            values = values[first:stop]
+        first_timestamp, last_timestamp = _get_window(timestamps, start, end)
+        if _may_hold_none(values):
+            present = [value is not None for value in values]
+            timestamps = list(compress(timestamps, present))
+            values = list(compress(values, present))
+        skip_nan = _is_float_buffer(values)
+        if aggregate == 'lttb':
+            if skip_nan:
+                present = [value == value for value in values]
+                timestamps = list(compress(timestamps, present))
+                values = list(compress(values, present))
+            if stats is not None:
+                stats.update(values)
+            return lttb(timestamps, values, max_width)
+
+        column_count = get_column_count(max_width, aggregate)
+        step_size = (last_timestamp - first_timestamp) / column_count
+        counts = _get_time_counts(timestamps, first_timestamp, step_size, column_count)
+        if gaps == 'zero':
+            return reduce_runs(values, counts, aggregate, stats, skip_nan=skip_nan)  # Reduce each column, 0 if no values
+        return fill_gaps(reduce_runs(values, counts, aggregate, stats, empty=None, skip_nan=skip_nan), gaps)
 
     def _scale_y_values(self, values, new_max, new_min=0, scale_old_from_zero=True):
         '''
         Take values and transmute them into a new range
         '''
+        if _is_ndarray(values):
+            return _numpy_backend().scale_y_values(values, new_max, new_min, scale_old_from_zero)
         # Scale Y values - Create a scaled list of values to use for the visual graph
         scaled_values = []
         y_min_value = min(values)
@@ -61,123 +306,396 @@ class Grapher(object):
         return scaled_values
 
     def _round_floats_to_ints(self, values):
+        if _is_ndarray(values):
+            return _numpy_backend().round_floats_to_ints(values)
         adjusted_values = [int(round(x)) for x in values]
         return adjusted_values
 
+    def _scale_columns(self, values, max_height, scale_old_from_zero=False):
+        '''Scale the columns to integer heights from 0 to max_height, blank columns (None) get the height _GAP'''
+        gaps = _may_hold_none(values) if not _is_ndarray(values) else False
+        present = [value for value in values if value is not None] if gaps else values
+        if not len(present):
+            return [_GAP] * len(values)
+        heights = self._run_stage('scale_y', self._scale_y_values, present, new_min=0, new_max=max_height, scale_old_from_zero=scale_old_from_zero)
+        heights = self._run_stage('round', self._round_floats_to_ints, heights)
+        if gaps:
+            heights = iter(heights)
+            heights = [_GAP if value is None else next(heights) for value in values]
+        return heights
+
     def _get_ascii_field(self, values):
-        '''Create a representation of an ascii graph using two lists in this format: field[x][y] = "char"'''
+        '''Create a representation of an ascii graph using two lists in this format: field[x][y] = "char"
 
-        empty_space = ' '
+        The heights are held in an array('q'), and every column is drawn by _get_field_column.
+        '''
+        if _is_ndarray(values):
+            return _numpy_backend().get_ascii_field(values)
+
+        heights = array('q', values)
+        height = self._get_graph_size(heights)[1]
 
         # This formats as field[x][y]
-        field = [[empty_space for y in range(max(values) + 1)] for x in range(len(values))]
-
-        # Draw graph into field
-        for x in range(len(values)):
-            y = values[x]
-            y_prev = values[x - 1] if x - 1 in range(len(values)) else y
-            y_next = values[x + 1] if x + 1 in range(len(values)) else y
-            # Fill empty space
-            if abs(y_prev - y) > 1:
-                # Fill space between y and y_prev
-                step = 1 if y_prev - y > 0 else -1
-
-                # We don't want the first item to be inclusive, so we use step instead of y+1 since step can be negative
-                for h in range(y + step, y_prev, step):
-                    if field[x][h] is empty_space:
-                        field[x][h] = '|'
-
-            # Assign the character to be placed into the graph
-            char = self._assign_ascii_character(y_prev, y, y_next)
-
-            field[x][y] = char
-        return field
-
-    def _assign_ascii_character(self, y_prev, y, y_next):  # noqa for complexity
+        neighbours = zip(heights[:1] + heights[:-1], heights, heights[1:] + heights[-1:])
+        return [self._get_field_column(y_prev, y, y_next, height) for y_prev, y, y_next in neighbours]
+
+    def _get_field_column(self, y_prev, y, y_next, height):
+        '''Draw the column of the point y, height characters from the bottom up, joined to y_prev with a vertical run'''
+        column = [' '] * height
+        if y == _GAP:
+            return column
+        # A point next to a gap is drawn as if the line were flat on that side
+        y_prev = y if y_prev == _GAP else y_prev
+        y_next = y if y_next == _GAP else y_next
+        # Fill the space between y and y_prev
+        low, high = (y, y_prev) if y < y_prev else (y_prev, y)
+        if high - low > 1:
+            column[low + 1:high] = '|' * (high - low - 1)
+        column[y] = self._assign_ascii_character(y_prev, y, y_next)
+        return column
+
+    def _assign_ascii_character(self, y_prev, y, y_next):
         '''Assign the character to be placed into the graph'''
-        char = '?'
-        if y_next > y and y_prev > y:
-            char = '-'
-        elif y_next < y and y_prev < y:
-            char = '-'
-        elif y_prev < y and y == y_next:
-            char = '-'
-        elif y_prev == y and y_next < y:
-            char = '-'
-        elif y_next > y:
-            char = '/'
-        elif y_next < y:
-            char = '\\'
-        elif y_prev > y:
-            char = '\\'
-        elif y_next == y:
-            char = '-'
-        return char
+        return _SLOPE_CHARACTERS[_get_slope_index(y_prev, y, y_next)]
 
     def _draw_ascii_graph(self, field):
         '''Draw graph from field double nested list, format field[x][y] = char'''
-        row_strings = []
-        for y in range(len(field[0])):
-            row = ''
-            for x in range(len(field)):
-                row += field[x][y]
-            row_strings.insert(0, row)
-        graph_string = '\n'.join(row_strings)
+        if _is_ndarray(field):
+            return _numpy_backend().draw_ascii_graph(field)
+        row_strings = [''.join(column[y] for column in field) for y in range(len(field[0]))]
+        graph_string = '\n'.join(reversed(row_strings))
         return graph_string
 
-    def asciigraph(self, values, max_height=None, max_width=None, label=False):
+    def _draw_ascii_rows(self, values, canvas=None):
+        '''Draw graph rows straight from the integer y values, without building the field[x][y] representation
+
+        The rows are drawn into a single buffer holding one byte per character, newlines included, see
+        _draw_ascii_canvas.
         '''
-        Accepts a list of y values and returns an ascii graph
-        Optionally values can also be a dictionary with a key of timestamp, and a value of value. InGraphs returns data in this format for example.
+        if _is_ndarray(values):
+            return self._draw_ascii_graph(self._get_ascii_field(values))
+        return str(memoryview(self._draw_ascii_canvas(values, canvas))[:-1], 'ascii')
+
+    def _draw_ascii_canvas(self, values, canvas=None):
+        '''Draw the integer y values into a buffer of ascii rows, top row first, each ending with a newline
+
+        The space between a point and the previous one is filled with one strided slice assignment down the column.
+        A blank canvas of the right size, see _get_blank_canvas, can be given to draw on instead of allocating one.
         '''
+        heights = array('q', values)
+        width, height = self._get_graph_size(heights)
+        stride = width + 1
+        if canvas is None:
+            canvas = bytearray(self._get_blank_canvas(width, height))
+        top = (height - 1) * stride  # Offset of row 0, the rows are stored top down
+
+        for x, (y_prev, y, y_next) in enumerate(zip(heights[:1] + heights[:-1], heights, heights[1:] + heights[-1:])):
+            if y == _GAP:
+                continue
+            y_prev = y if y_prev == _GAP else y_prev
+            y_next = y if y_next == _GAP else y_next
+            low, high = (y, y_prev) if y < y_prev else (y_prev, y)
+            if high - low > 1:
+                canvas[top - (high - 1) * stride + x:top - low * stride + x:stride] = _VERTICAL_FILL * (high - low - 1)
+            canvas[top - y * stride + x] = _SLOPE_CODES[_get_slope_index(y_prev, y, y_next)]
+        return canvas
+
+    def _get_graph_size(self, heights):
+        '''Width and height in rows of the graph of the integer heights, one blank row when every column is a gap'''
+        return len(heights), max(max(heights), 0) + 1
+
+    def _get_blank_canvas(self, width, height):
+        '''The bytes of height blank rows of width characters, each ending with a newline'''
+        return (b' ' * width + b'\n') * height
+
+    def _prepare_values(self, values, backend):
+        '''Convert the values to the type the requested backend works on'''
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown backend {backend!r}, expected one of {BACKENDS}')
+        if backend == 'numpy' and not _is_ndarray(values):
+            try:
+                numpy_backend = _numpy_backend()
+            except ImportError:
+                return values  # NumPy isn't installed, fall back to pure Python
+            if isinstance(values, dict):
+                return numpy_backend.as_timeseries_array(values)
+            return numpy_backend.as_array(values)
+        if backend == 'python' and _is_ndarray(values):
+            if values.ndim == 2:
+                return {timestamp: value if value == value else None for timestamp, value in values.tolist()}
+            return [value if value == value else None for value in values.tolist()]
+        return values
+
+    def _is_timeseries(self, values):
+        '''Timeseries are a dictionary of timestamp -> value, or a (n, 2) NumPy array of timestamp, value rows'''
+        return isinstance(values, dict) or (_is_ndarray(values) and _numpy_backend().is_timeseries_array(values))
+
+    def _is_iterator(self, values):
+        '''Iterators, generators and other iterables that aren't sequences can only be consumed once'''
+        return not isinstance(values, (Sequence, dict)) and not _is_ndarray(values)
+
+    def _drop_missing(self, values):
+        '''Drop None values, or NaN values from NumPy arrays, NaN values of float buffers are skipped by _scale_x_values'''
+        if _is_ndarray(values):
+            return _numpy_backend().drop_missing(values)
+        if isinstance(values, Sequence) and not _may_hold_none(values):
+            return values
+        return [value for value in values if value is not None]
+
+    def _get_columns(self, values, max_width, label=False, backend=None, aggregate=DEFAULT_AGGREGATE, timestamps=None, length=None, gaps='zero',
+                     start=None, end=None):
+        '''Scale the values to at most max_width columns, and gather what the labels need
+
+        The gaps, start and end of timeseries are handled by _scale_x_values_timestamps, blank columns are None.
+        Summaries of a series, such as a SeriesPyramid, return their own columns, see _has_columns.
+        '''
+        if gaps not in GAP_MODES:
+            raise ValueError(f'Unknown gap mode {gaps!r}, expected one of {GAP_MODES}')
+        if _has_columns(values):
+            if start is not None or end is not None:
+                if not hasattr(values, 'zoom'):
+                    raise ValueError(f'{type(values).__name__} covers the fixed time window it was created with')
+                values = values.zoom(start, end)
+            return self._run_stage('scale_x', values.get_columns, max_width, aggregate, label, gaps)
         start_ctime = None
         end_ctime = None
+        stats = RunningStats() if label else None
 
-        max_width = max_width or DEFAULT_MAX_WIDTH
+        values = self._prepare_values(values, backend)
+        if timestamps is not None:
+            timestamps = self._prepare_values(timestamps, backend)
 
         # If this is a dict of timestamp -> value, sort the data, store the start/end time, and convert values to a list of values
-        if isinstance(values, dict):
-            time_series_sorted = self._sort_timeseries_values(values)
-            start_ctime, end_ctime = self._get_start_and_end_ctimes(time_series_sorted)
-            values = self._scale_x_values_timestamps(values=time_series_sorted, max_width=max_width)
-        values = [value for value in values if value is not None]
+        if timestamps is not None or self._is_timeseries(values):
+            timestamps, values = self._run_stage('sort', self._split_timeseries, values, timestamps)
+            start_ctime, end_ctime = self._get_start_and_end_ctimes(_get_window(timestamps, start, end))
+            adjusted_values = self._run_stage('scale_x', self._scale_x_values_timestamps, values, max_width=max_width, aggregate=aggregate,
+                                              timestamps=timestamps, stats=stats, gaps=gaps, start=start, end=end)
+            if gaps == 'zero':
+                max_value = max(adjusted_values)
+            else:
+                max_value = max((value for value in adjusted_values if value is not None), default=0)
+        elif self._is_iterator(values):
+            # Iterators are consumed once, straight into the columns, which is also where the largest value is found
+            stats = stats or RunningStats()
+            adjusted_values = self._run_stage('scale_x', self._scale_x_values, values, max_width=max_width, aggregate=aggregate, stats=stats, length=length)
+            max_value = stats.high
+        else:
+            values = self._drop_missing(values)
+            if _is_float_buffer(values):
+                # The largest value that isn't NaN is found while scaling, like for iterators
+                stats = stats or RunningStats()
+            adjusted_values = self._run_stage('scale_x', self._scale_x_values, values, max_width=max_width, aggregate=aggregate, stats=stats)
+            max_value = stats.high if stats is not None else (values.max() if _is_ndarray(values) else max(values))
 
-        if not max_height:
-            max_height = min(20, max(values))
+        if not label or not stats.count:
+            # An empty time window has no statistics to label
+            return Columns(adjusted_values, None, None, max_value, None, None, start_ctime, end_ctime)
+        # The label statistics were gathered from the raw values while scaling them
+        return Columns(adjusted_values, stats.high, stats.low, max_value, stats.stdev, stats.mean, start_ctime, end_ctime)
+
+    def _get_cached(self, key, compute):
+        '''Return the cached result for the key, computing and caching it on a miss'''
+        if key is None:
+            return compute()
+        result = self.cache.get(key)
+        if result is None:
+            result = compute()
+            self.cache.set(key, result)
+        return result
+
+    def _get_cache_keys(self, method, values, timestamps, render_options, column_options):
+        '''Return the cache keys of a render and of its columns, None when not caching'''
+        if self.cache is None:
+            return None, None
+        from asciietch.cache import fingerprint
+
+        series_fingerprint = fingerprint(values, timestamps)
+        if series_fingerprint is None:
+            return None, None
+        return (method, series_fingerprint) + render_options, ('columns', series_fingerprint) + column_options
+
+    def asciigraph(self, values, max_height=None, max_width=None, label=False, backend=None, aggregate=DEFAULT_AGGREGATE, timestamps=None,
+                   length=None, glyphs=None, gaps='zero', start=None, end=None):
+        '''
+        Accepts a list of y values and returns an ascii graph
+        Optionally values can also be a dictionary with a key of timestamp, and a value of value. InGraphs returns data in this format for example.
+        When there are more values than max_width, each column is reduced with the aggregate: mean, min, max, last,
+        minmax (the lowest and highest value of every two columns) or lttb (Largest-Triangle-Three-Buckets).
+        Timestamps can also be given as a separate sequence, such as an array('d'), parallel to the values. Sorting is skipped
+        when the timestamps are already in order.
+        NumPy arrays, and (n, 2) arrays of timestamp, value rows, are rendered with vectorized operations. Pass backend='numpy'
+        to convert other array-likes to NumPy arrays first, or backend='python' to always use the pure Python pipeline.
+        Renders are cached when the Grapher was created with a RenderCache.
+        Values can also be any iterable, such as rows streamed from a file. When its length is given, or hinted by the
+        iterable, it is downsampled as it is read, so memory use depends on max_width rather than on the number of values.
+        Several series can be overlaid on one graph by passing a list of them, see _get_overlay_columns. They share
+        the Y axis, and each series is drawn with its own character from glyphs, OVERLAY_GLYPHS by default.
+        Columns of a timeseries without any values are drawn at 0 by default. Pass gaps='blank' to leave them blank, or
+        gaps='carry' to draw them at the value of the previous column. start and end set the time window to graph, values
+        outside of it are left out.
+        '''
+        max_width = max_width or DEFAULT_MAX_WIDTH
+        if _is_overlay(values):
+            if gaps != 'zero' or start is not None or end is not None:
+                raise ValueError('Overlays span the time range of all the series, gaps, start and end are not supported')
+            columns = self._get_overlay_columns(values, max_width, label, backend, aggregate, timestamps)
+            return self._render_overlay(columns, max_height, max_width, label, glyphs or OVERLAY_GLYPHS)
+        column_options = (max_width, label, backend, aggregate, gaps, start, end)
+        render_key, columns_key = self._get_cache_keys('asciigraph', values, timestamps, (max_height,) + column_options, column_options)
 
+        def render():
+            columns = self._get_cached(columns_key, lambda: self._get_columns(values, max_width, label, backend, aggregate, timestamps, length,
+                                                                              gaps, start, end))
+            return self._render_graph(columns, max_height, max_width, label)
+
+        return self._get_cached(render_key, render)
+
+    def _render_graph(self, columns, max_height, max_width, label):
+        '''Draw the graph of the scaled columns'''
         # Do value adjustments
-        adjusted_values = self._scale_x_values(values=values, max_width=max_width)
-        upper_value = max(adjusted_values)  # Getting upper/lower after scaling x values so we don't label a spike we can't see
-        lower_value = min(adjusted_values)
-        adjusted_values = self._scale_y_values(values=adjusted_values, new_min=0, new_max=max_height, scale_old_from_zero=False)
-        adjusted_values = self._round_floats_to_ints(values=adjusted_values)
+        adjusted_values = self._get_graph_heights(columns, max_height)
 
         # Obtain Ascii Graph String
-        field = self._get_ascii_field(adjusted_values)
-        graph_string = self._draw_ascii_graph(field=field)
+        graph_string = self._run_stage('draw', self._draw_ascii_rows, adjusted_values)
 
         # Label the graph
-
         if label:
-            stdev = statistics.stdev(values)
-            mean = statistics.mean(values)
-
-            result = self._surround_with_label(graph_string,
-                                               max_width,
-                                               upper_value,
-                                               lower_value,
-                                               stdev,
-                                               mean,
-                                               start_ctime,
-                                               end_ctime)
+            return self._run_stage('label', self._surround_with_columns_label, graph_string, max_width, columns)
+        return graph_string
+
+    def _get_graph_heights(self, columns, max_height):
+        '''Scale the columns to the rows of a graph, at most 20 rows high when max_height isn't given'''
+        return self._scale_columns(columns.values, max_height or min(20, columns.max_value))
+
+    def _get_overlay_columns(self, series, max_width, label=False, backend=None, aggregate=DEFAULT_AGGREGATE, timestamps=None):
+        '''Scale several series to columns that line up on a shared X axis
+
+        Series with timestamps, either timeseries dictionaries or values sharing the given timestamps, are binned over
+        the time range of all of them. Shared timestamps are sorted and binned once, and every series is reduced
+        with the same column counts. Series without timestamps line up by position, series of the same length share
+        their column counts too. Columns.values holds the columns of every series.
+        '''
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown backend {backend!r}, expected one of {BACKENDS}')
+        aggregate = resolve_aggregate(aggregate, max_width)
+        if aggregate == 'lttb':
+            raise ValueError('lttb picks different points for every series, they can not be overlaid')
+        stats = RunningStats() if label else None
+        start_ctime = None
+        end_ctime = None
+
+        # Overlays always go through the pure Python pipeline
+        series = [self._prepare_values(values, 'python') for values in series]
+        timeseries = [self._is_timeseries(values) for values in series]
+        if timestamps is not None:
+            timestamps = self._prepare_values(timestamps, 'python')
+            if timestamps and isinstance(timestamps[0], str):
+                timestamps = list(map(float, timestamps))
+            if not _is_sorted(timestamps):
+                # Sort the shared timestamps once, and every series the same way
+                order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+                timestamps = [timestamps[i] for i in order]
+                series = [[values[i] for i in order] for values in series]
+            series = [(timestamps, values) for values in series]
+        elif all(timeseries):
+            series = [self._split_timeseries(values) for values in series]
+        elif any(timeseries):
+            raise ValueError('Series with and without timestamps can not be overlaid')
+
+        column_counts = {}  # Keyed by the id of the timestamps, or by the number of values
+        adjusted_series = []
+        if timestamps is not None or all(timeseries):
+            first_timestamp = min(timestamps[0] for timestamps, _ in series if timestamps)
+            last_timestamp = max(timestamps[-1] for timestamps, _ in series if timestamps)
+            start_ctime, end_ctime = self._get_start_and_end_ctimes((first_timestamp, last_timestamp))
+            column_count = get_column_count(max_width, aggregate)
+            step_size = (last_timestamp - first_timestamp) / column_count
+            for timestamps, values in series:
+                if _may_hold_none(values):
+                    present = [value is not None for value in values]
+                    timestamps = list(compress(timestamps, present))
+                    values = list(compress(values, present))
+                if id(timestamps) not in column_counts:
+                    # Hold on to the timestamps so their id isn't reused
+                    column_counts[id(timestamps)] = (timestamps, _get_time_counts(timestamps, first_timestamp, step_size, column_count))
+                adjusted_series.append(reduce_runs(values, column_counts[id(timestamps)][1], aggregate, stats))
+            max_value = max(max(values) for values in adjusted_series)
         else:
-            result = graph_string
-        return result
+            max_value = None
+            for values in series:
+                values = self._drop_missing(values)
+                if not values:
+                    adjusted_series.append([])
+                    continue
+                max_value = max(values) if max_value is None else max(max_value, max(values))
+                if len(values) <= max_width:
+                    if stats is not None:
+                        stats.update(values)
+                    adjusted_series.append(list(values))
+                    continue
+                if len(values) not in column_counts:
+                    column_count = get_column_count(max_width, aggregate)
+                    positions = [len(values) * i // column_count for i in range(column_count + 1)]
+                    column_counts[len(values)] = list(map(sub, positions[1:], positions))
+                adjusted_series.append(reduce_runs(values, column_counts[len(values)], aggregate, stats))
+
+        if not label:
+            return Columns(adjusted_series, None, None, max_value, None, None, start_ctime, end_ctime)
+        return Columns(adjusted_series, stats.high, stats.low, max_value, stats.stdev, stats.mean, start_ctime, end_ctime)
+
+    def _render_overlay(self, columns, max_height, max_width, label, glyphs):
+        '''Draw the scaled columns of several series onto one field, in one pass over the columns'''
+        series = columns.values
+        if len(series) > len(glyphs):
+            raise ValueError(f'{len(series)} series to overlay but only {len(glyphs)} glyphs')
+        if not max_height:
+            max_height = min(20, columns.max_value)
+
+        # Scale every series to the same Y range
+        adjusted_values = self._scale_y_values(values=[value for values in series for value in values], new_min=0, new_max=max_height,
+                                               scale_old_from_zero=False)
+        adjusted_values = iter(self._round_floats_to_ints(values=adjusted_values))
+        series = [list(islice(adjusted_values, len(values))) for values in series]
+
+        width = max(map(len, series))
+        height = max(max(values) for values in series if values) + 1
+        stride = width + 1
+        canvas = ([' '] * width + ['\n']) * height
+        top = (height - 1) * stride  # Offset of row 0, the rows are stored top down
+        drawn = [(values, glyph) for values, glyph in zip(series, glyphs) if values]
+        for x in range(width):
+            # Later series are drawn over earlier ones
+            for values, glyph in drawn:
+                if x >= len(values):
+                    continue
+                y = values[x]
+                y_prev = values[x - 1] if x else y
+                for h in range(min(y, y_prev) + 1, max(y, y_prev)):
+                    canvas[top - h * stride + x] = glyph
+                canvas[top - y * stride + x] = glyph
+        graph_string = ''.join(canvas[:-1])
+
+        if label:
+            return self._run_stage('label', self._surround_with_columns_label, graph_string, max_width, columns)
+        return graph_string
+
+    def _surround_with_columns_label(self, graph_string, max_width, columns):
+        return self._surround_with_label(graph_string,
+                                         max_width,
+                                         columns.upper_value,
+                                         columns.lower_value,
+                                         columns.stdev,
+                                         columns.mean,
+                                         columns.start_ctime,
+                                         columns.end_ctime)
 
-    def _get_start_and_end_ctimes(self, time_series_sorted):
-        """Get the start and end times of a sorted time series data as ctime. """
-        start_timestamp = time_series_sorted[0][0]
-        end_timestamp = time_series_sorted[-1][0]
+    def _get_start_and_end_ctimes(self, timestamps):
+        """Get the start and end times of sorted timestamps as ctime. """
+        start_timestamp = timestamps[0]
+        end_timestamp = timestamps[-1]
+
+        from datetime import datetime
 
         start_ctime = datetime.fromtimestamp(float(start_timestamp)).ctime()
         end_ctime = datetime.fromtimestamp(float(end_timestamp)).ctime()
@@ -189,7 +707,29 @@ class Grapher(object):
 
         Sort the timeseries data and return as list of tuples.
         """
-        return sorted(values_dict.items(), key=lambda x: x[0])
+        if _is_ndarray(values_dict):
+            return _numpy_backend().sort_timeseries_values(values_dict)
+        return sorted(values_dict.items(), key=itemgetter(0))
+
+    def _split_timeseries(self, values, timestamps=None):
+        """Split timeseries data into parallel sequences of timestamps and values, sorted by timestamp.
+
+        Values are a timestamp -> value dictionary, a (n, 2) NumPy array of timestamp, value rows, or a sequence of
+        values with their timestamps given separately. Timestamps given as strings are converted to floats, and the
+        sort is skipped when the timestamps are already in order.
+        """
+        if _is_ndarray(values) or _is_ndarray(timestamps):
+            return _numpy_backend().split_timeseries(values, timestamps)
+        if timestamps is None:
+            timestamps = list(values)
+            values = list(values.values())
+        if timestamps and isinstance(timestamps[0], str):
+            timestamps = list(map(float, timestamps))
+        if not _is_sorted(timestamps):
+            order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+            timestamps = [timestamps[i] for i in order]
+            values = [values[i] for i in order]
+        return timestamps, values
 
     def _surround_with_label(self,
                              graph_string,
@@ -205,78 +745,381 @@ class Grapher(object):
         It adds a top label with the max value of the data.
         And a bottom label with min value and data statistics.
         """
-        top_label = f'Upper value: {max_val:.2f} '.ljust(max_width, BORDER_FILL_CHARACTER)
-        lower = f'Lower value: {min_val:.2f} '
-        stats = f' Mean: {mean:.2f} *** Std Dev: {stdev:.2f} ******'
-        fill_length = max_width - len(lower) - len(stats)
-        stat_label = f'{lower}{"*" * fill_length}{stats}'
+        top_label, footer = self._get_label_lines(max_width, max_val, min_val, stdev, mean, start_ctime, end_ctime)
+        return top_label + '\n' + graph_string + footer
+
+    def _get_label_lines(self, max_width, max_val, min_val, stdev, mean, start_ctime=None, end_ctime=None, fills=None):
+        """Return the top label, and the footer that follows the graph starting with a newline.
 
-        result = top_label + '\n' + graph_string + '\n' + stat_label
+        The border and the space between the times are cut from fills, the runs returned by _get_label_fills, which
+        can be built once for labelling many graphs of the same width.
+        """
+        border, spaces = fills or self._get_label_fills(max_width)
+        top = f'Upper value: {_format_label_value(max_val)} '
+        top_label = top + border[len(top):]
+        lower = f'Lower value: {_format_label_value(min_val)} '
+        stats = f' Mean: {_format_label_value(mean)} *** Std Dev: {_format_label_value(stdev)} ******'
+        fill_length = max_width - len(lower) - len(stats)
+        footer = f'\n{lower}{border[:max(fill_length, 0)]}{stats}'
 
         if start_ctime and end_ctime:
             fill_length = max_width - len(start_ctime) - len(end_ctime)
-            time_label = f'{start_ctime} {" " * fill_length}{end_ctime}\n'
-            result += '\n' + time_label
+            footer += f'\n{start_ctime} {spaces[:max(fill_length, 0)]}{end_ctime}\n'
 
-        return result
+        return top_label, footer
 
-    def asciihist(self, values, max_width=None, label=False):
+    def _get_label_fills(self, max_width):
+        """Return the runs of border characters and spaces the labels of a graph max_width wide are cut from."""
+        return BORDER_FILL_CHARACTER * max_width, ' ' * max_width
+
+    def asciihist(self, values, max_width=None, label=False, backend=None, aggregate=DEFAULT_AGGREGATE, timestamps=None, length=None, gaps='zero',
+                  start=None, end=None):
         """Draw an ascii histogram of the given values.
 
         Values can also be a dictionary of timestamp and data.
+        The backend, aggregate, timestamps, length, gaps, start and end arguments work like they do for asciigraph.
         """
-        allowed_bars_in_order = ('▁', '▂', '▃', '▄', '▅', '▆', '▇', '█')
+        max_width = max_width or DEFAULT_MAX_WIDTH
+        column_options = (max_width, label, backend, aggregate, gaps, start, end)
+        render_key, columns_key = self._get_cache_keys('asciihist', values, timestamps, column_options, column_options)
 
-        start_ctime = None
-        end_ctime = None
+        def render():
+            columns = self._get_cached(columns_key, lambda: self._get_columns(values, max_width, label, backend, aggregate, timestamps, length,
+                                                                              gaps, start, end))
+            return self._render_hist(columns, max_width, label)
+
+        return self._get_cached(render_key, render)
+
+    def _render_hist(self, columns, max_width, label):
+        '''Draw the histogram of the scaled columns'''
+        max_height = len(HISTOGRAM_BARS) - 1
+
+        # Do value adjustments
+        adjusted_values = self._scale_columns(columns.values, max_height)
+
+        # Obtain Ascii Histogram String
+        graph_string = self._run_stage('draw', self._draw_histogram, adjusted_values)
+
+        # Label the graph
+        if label:
+            return self._run_stage('label', self._surround_with_columns_label, graph_string, max_width, columns)
+        return graph_string
+
+    def asciidist(self, values, max_width=None, label=False, scale='linear', quantiles=None):
+        """Draw an ascii histogram of the distribution of the values.
+
+        Unlike asciihist, which draws the values in order, every bar counts the values falling into one of max_width
+        equal bins between the lowest and highest value, on a linear or log scale. Values are any iterable or NumPy
+        array, read in one pass into a DistributionSketch, or a sketch to render, such as one merged from the
+        sketches of several processes. Empty bins are left blank. The label marks the quantiles, DEFAULT_QUANTILES
+        by default, under the bars and reports their values.
+        """
+        from asciietch.sketch import DEFAULT_QUANTILES, DistributionSketch
 
         max_width = max_width or DEFAULT_MAX_WIDTH
+        sketch = values if isinstance(values, DistributionSketch) else DistributionSketch(values)
+        counts = self._run_stage('scale_x', sketch.get_counts, max_width, scale)
+        adjusted_values = self._scale_columns([count or None for count in counts], len(HISTOGRAM_BARS) - 1, scale_old_from_zero=True)
+        graph_string = self._run_stage('draw', self._draw_histogram, adjusted_values)
+        if not label:
+            return graph_string
+        return self._run_stage('label', self._surround_with_quantiles, graph_string, max_width, sketch, scale,
+                               DEFAULT_QUANTILES if quantiles is None else quantiles)
 
-        max_height = len(allowed_bars_in_order) - 1
+    def _surround_with_quantiles(self, graph_string, max_width, sketch, scale, quantiles):
+        '''Label a distribution with its statistics, a ^ under the bin of every quantile and a line of their values'''
+        bins = len(graph_string)
+        markers = [' '] * bins
+        quantile_labels = []
+        for q in quantiles:
+            value = sketch.quantile(q)
+            markers[sketch.get_bin(value, bins, scale)] = '^'
+            quantile_labels.append(f'p{q * 100:g}: {value:.2f}')
+        stats = sketch.stats
+        result = self._surround_with_label(graph_string + '\n' + ''.join(markers), max_width, stats.high, stats.low, stats.stdev, stats.mean)
+        return result + '\n' + ' '.join(quantile_labels)
 
-        # If this is a dict of timestamp -> value, sort the data, store the start/end time, and convert values to a list of values
-        if isinstance(values, dict):
-            time_series_sorted = self._sort_timeseries_values(values)
-            start_ctime, end_ctime = self._get_start_and_end_ctimes(time_series_sorted)
-            values = self._scale_x_values_timestamps(values=time_series_sorted, max_width=max_width)
+    def asciibraille(self, values, max_height=None, max_width=None, label=False, backend=None, aggregate=DEFAULT_AGGREGATE, timestamps=None,
+                     length=None, gaps='zero', start=None, end=None):
+        """Draw a line graph of the given values with Braille characters.
 
-        values = [value for value in values if value is not None]
+        Every character is a cell of 2x4 dots, so a graph of max_width characters shows 2 * max_width values and
+        max_height rows have 4 * max_height levels. The arguments work like they do for asciigraph.
+        """
+        max_width = max_width or DEFAULT_MAX_WIDTH
+        column_options = (2 * max_width, label, backend, aggregate, gaps, start, end)  # The same columns as an asciigraph twice as wide
+        render_key, columns_key = self._get_cache_keys('asciibraille', values, timestamps, (max_height, max_width) + column_options[1:],
+                                                       column_options)
 
-        # Do value adjustments
-        adjusted_values = self._scale_x_values(values=values, max_width=max_width)
+        def render():
+            columns = self._get_cached(columns_key, lambda: self._get_columns(values, 2 * max_width, label, backend, aggregate, timestamps, length,
+                                                                              gaps, start, end))
+            return self._render_braille(columns, max_height, max_width, label)
 
-        # Getting upper/lower after scaling x values so we don't label a spike we can't see
-        upper_value = max(adjusted_values)
-        lower_value = min(adjusted_values)
+        return self._get_cached(render_key, render)
 
-        adjusted_values = self._scale_y_values(values=adjusted_values, new_min=0,
-                                               new_max=max_height, scale_old_from_zero=False)
-        adjusted_values = self._round_floats_to_ints(values=adjusted_values)
+    def _render_braille(self, columns, max_height, max_width, label):
+        '''Draw the scaled columns as Braille dots, two columns and four levels per character'''
+        adjusted_values = self._get_braille_levels(columns, max_height)
+        graph_string = self._run_stage('draw', self._draw_braille_rows, adjusted_values)
 
-        # Obtain Ascii Histogram String
-        field = [allowed_bars_in_order[val] for val in adjusted_values]
+        if label:
+            return self._run_stage('label', self._surround_with_columns_label, graph_string, max_width, columns)
+        return graph_string
 
-        graph_string = self._draw_ascii_graph(field=field)
+    def _get_braille_levels(self, columns, max_height):
+        '''Scale the columns to dot levels, four per row of Braille characters'''
+        if not max_height:
+            max_height = min(20, columns.max_value)
+        max_height = max(int(max_height), 1)
 
-        # Label the graph
+        adjusted_values = self._scale_columns(columns.values, 4 * max_height - 1)
+        if _is_ndarray(adjusted_values):
+            adjusted_values = adjusted_values.tolist()
+        return adjusted_values
+
+    def _draw_braille_rows(self, values, cells=None):
+        '''Draw integer dot levels into rows of Braille cells, four levels per row, see _draw_braille_cells'''
+        characters, width = self._draw_braille_cells(values, cells)
+        return '\n'.join(characters[start:start + width] for start in range(0, len(characters), width))
+
+    def _draw_braille_cells(self, values, cells=None):
+        '''Draw integer dot levels into Braille characters, returned with the width of their rows
+
+        Each value is joined to the previous one with a vertical run of dots. Runs are set a cell at a time, by or-ing
+        in the mask of the dots they cover, and all the cells are turned into characters with one translate. A zeroed
+        bytearray of the right size, see _get_braille_size, can be given to draw on instead of allocating one.
+        '''
+        width, height = self._get_braille_size(values)
+        if cells is None:
+            cells = bytearray(height * width)
+        top_dot = 4 * height - 1
+
+        y_prev = values[0]
+        for x, y in enumerate(values):
+            if y == _GAP:
+                y_prev = y
+                continue
+            if y_prev == _GAP:
+                y_prev = y
+            # Rows of dots counted from the top, the run covers y itself and the dots up to y_prev
+            if y > y_prev:
+                first, last = top_dot - y, top_dot - y_prev - 1
+            elif y < y_prev:
+                first, last = top_dot - y_prev + 1, top_dot - y
+            else:
+                first = last = top_dot - y
+            spans = _BRAILLE_SPANS[x & 1]
+            cell = x >> 1
+            for row in range(first >> 2, (last >> 2) + 1):
+                cells[row * width + cell] |= spans[max(first - 4 * row, 0)][min(last - 4 * row, 3)]
+            y_prev = y
+        return cells.decode('latin1').translate(_BRAILLE_CHARACTERS), width
+
+    def _get_braille_size(self, values):
+        '''Width and height in characters of the Braille drawing of the integer dot levels'''
+        return (len(values) + 1) // 2, max(max(values), 0) // 4 + 1
+
+    def _draw_histogram(self, values):
+        '''Draw a bar for each of the integer heights'''
+        field = [' ' if val == _GAP else HISTOGRAM_BARS[val] for val in values]
+        return self._draw_ascii_graph(field=field)
+
+    async def aasciigraph(self, values, executor=None, **options):
+        """Render asciigraph without blocking the event loop.
+
+        Values can also be an async iterable of values, or of (timestamp, value) pairs, which is read first.
+        Renders of up to inline_render_size values run inline, larger ones run in the executor, the event loop's
+        default executor unless one is given, with at most max_concurrent_renders of them at a time. Options are
+        passed on to asciigraph.
+        """
+        return await self._arender('asciigraph', values, executor, options)
+
+    async def aasciihist(self, values, executor=None, **options):
+        """Render asciihist without blocking the event loop, see aasciigraph."""
+        return await self._arender('asciihist', values, executor, options)
+
+    async def _arender(self, method, values, executor, options):
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+
+        if hasattr(values, '__aiter__'):
+            values, timestamps = await _collect_samples(values)
+            if timestamps is not None:
+                options = dict(options, timestamps=timestamps)
+        size = _render_size(values)
+        if size is not None and size <= self.inline_render_size:
+            return getattr(self, method)(values, **options)
+
+        loop = asyncio.get_event_loop()  # The running loop, asyncio.get_running_loop needs Python 3.7
+        if self._render_semaphore is None or self._render_semaphore[0] is not loop:
+            self._render_semaphore = (loop, asyncio.Semaphore(self.max_concurrent_renders))
+        if isinstance(executor, ProcessPoolExecutor):
+            # Only the class and the arguments can be sent to another process
+            render = partial(_render_chunk, type(self), method, [values], options)
+        else:
+            render = partial(getattr(self, method), values, **options)
+        async with self._render_semaphore[1]:
+            result = await loop.run_in_executor(executor, render)
+        return result[0] if isinstance(executor, ProcessPoolExecutor) else result
+
+    def render_many(self, series, method='asciigraph', max_workers=None, chunksize=16, executor=None, **options):
+        """Render many series with asciigraph, or the method named by method, across a pool of processes.
+
+        Series are sent to the workers in chunks of chunksize, and at most two chunks per worker are in flight at
+        a time so memory stays bounded no matter how long the series iterable is. Results are yielded as a
+        generator in the same order as the series. Pass an existing concurrent.futures executor to reuse it, or
+        max_workers=1 to render in this process. Options are passed on to the render method.
+        """
+        if method not in RENDER_METHODS:
+            raise ValueError(f'Unknown render method {method!r}, expected one of {RENDER_METHODS}')
+        if executor is None and max_workers == 1:
+            render = getattr(self, method)
+            for values in series:
+                yield render(values, **options)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+        in_flight = deque()
+        iterator = iter(series)
+        try:
+            while True:
+                while len(in_flight) < max_in_flight:
+                    chunk = list(islice(iterator, chunksize))
+                    if not chunk:
+                        break
+                    in_flight.append(executor.submit(_render_chunk, type(self), method, chunk, options))
+                if not in_flight:
+                    break
+                yield from in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=True)
+
+    def render_file(self, path, format=None, method='asciigraph', **options):
+        """Render a memory-mapped series file with asciigraph, or the method named by method.
+
+        See asciietch.mapped for the supported formats. Values are read straight from the memory map, and timestamps
+        are used when the file has them. Options are passed on to the render method.
+        """
+        if method not in RENDER_METHODS:
+            raise ValueError(f'Unknown render method {method!r}, expected one of {RENDER_METHODS}')
+        from asciietch.mapped import map_series
+
+        with map_series(path, format) as series:
+            return getattr(self, method)(series.values, timestamps=series.timestamps, **options)
+
+    def render_to(self, stream, values, method='asciigraph', buffer_size=0, **options):
+        """Write a render with asciigraph, or the method named by method, straight to a writable stream.
+
+        The top label is written before the graph is drawn, then the graph row by row and the footer, so the full
+        string is never built. Text streams are written strings, binary streams such as sockets' makefile('wb') or
+        io.BytesIO are written UTF-8 bytes, and the rows of graphs are written straight from the buffer they were
+        drawn in. With a buffer_size the pieces are batched into writes of at least that many characters. What is
+        written is the string the method returns, and the number of characters or bytes written is returned.
+        Options are passed on to the render method.
+        """
+        if method not in RENDER_METHODS:
+            raise ValueError(f'Unknown render method {method!r}, expected one of {RENDER_METHODS}')
+        import io
+
+        binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(stream, 'mode', '')
+        if self.cache is not None or _is_overlay(values):
+            pieces = [getattr(self, method)(values, **options)]  # Served from, or stored in, the render cache
+        else:
+            pieces = self._iter_render(method, values, **options)
+
+        written = 0
+        batch = []
+        batch_size = 0
+        for piece in pieces:
+            if binary and isinstance(piece, str):
+                piece = piece.encode('utf-8')
+            elif not binary and not isinstance(piece, str):
+                piece = str(piece, 'ascii')
+            batch.append(piece)
+            batch_size += len(piece)
+            if batch_size >= buffer_size:
+                stream.write(batch[0] if len(batch) == 1 else (b'' if binary else '').join(batch))
+                written += batch_size
+                batch = []
+                batch_size = 0
+        if batch:
+            stream.write((b'' if binary else '').join(batch))
+            written += batch_size
+        return written
+
+    def _iter_render(self, method, values, max_height=None, max_width=None, label=False, backend=None, aggregate=DEFAULT_AGGREGATE,
+                     timestamps=None, length=None, gaps='zero', start=None, end=None):
+        '''Yield the pieces of a render in order, labels as strings and the rows of ascii graphs as memoryviews of bytes'''
+        max_width = max_width or DEFAULT_MAX_WIDTH
+        column_width = 2 * max_width if method == 'asciibraille' else max_width
+        columns = self._get_columns(values, column_width, label, backend, aggregate, timestamps, length, gaps, start, end)
         if label:
-            stdev = statistics.stdev(values)
-            mean = statistics.mean(values)
-            result = self._surround_with_label(graph_string,
-                                               max_width,
-                                               upper_value,
-                                               lower_value,
-                                               stdev,
-                                               mean,
-                                               start_ctime,
-                                               end_ctime)
+            top_label, footer = self._run_stage('label', self._get_label_lines, max_width, columns.upper_value, columns.lower_value,
+                                                columns.stdev, columns.mean, columns.start_ctime, columns.end_ctime)
+            yield top_label + '\n'
+
+        if method == 'asciihist':
+            yield self._render_hist(columns, max_width, False)
+        elif method == 'asciibraille':
+            characters, width = self._run_stage('draw', self._draw_braille_cells, self._get_braille_levels(columns, max_height))
+            for row_start in range(0, len(characters), width):
+                yield characters[row_start:row_start + width]
+                if row_start + width < len(characters):
+                    yield '\n'
         else:
-            result = graph_string
+            heights = self._get_graph_heights(columns, max_height)
+            if _is_ndarray(heights):
+                heights = heights.tolist()
+            canvas = memoryview(self._run_stage('draw', self._draw_ascii_canvas, heights))
+            stride = len(heights) + 1
+            for row_start in range(0, len(canvas), stride):
+                yield canvas[row_start:min(row_start + stride, len(canvas) - 1)]  # Without the newline after the last row
+
+        if label:
+            yield footer
 
-        return result
+
+_grapher = Grapher()
+
+
+def asciigraph(values, **options):
+    '''Draw the values as an ascii line graph without creating a Grapher, see Grapher.asciigraph'''
+    return _grapher.asciigraph(values, **options)
+
+
+def asciihist(values, **options):
+    '''Draw the values as an ascii histogram without creating a Grapher, see Grapher.asciihist'''
+    return _grapher.asciihist(values, **options)
+
+
+def asciidist(values, **options):
+    '''Draw the distribution of the values as an ascii histogram without creating a Grapher, see Grapher.asciidist'''
+    return _grapher.asciidist(values, **options)
+
+
+def asciibraille(values, **options):
+    '''Draw the values as a Braille line graph without creating a Grapher, see Grapher.asciibraille'''
+    return _grapher.asciibraille(values, **options)
+
+
+def render_to(stream, values, **options):
+    '''Write a render straight to a text or binary stream without creating a Grapher, see Grapher.render_to'''
+    return _grapher.render_to(stream, values, **options)
 
 
 if __name__ == "__main__":
+    import random
+
     g = Grapher()
     values = []
     v = 0
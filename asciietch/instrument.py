@@ -0,0 +1,91 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Timing and allocation measurements of the stages of a render.
+
+Grapher reports every stage it runs to its instrument, when it has one:
+
+- 'sort': sorting timeseries by timestamp
+- 'scale_x': downsampling the values to the width of the graph
+- 'scale_y': scaling the columns to the height of the graph
+- 'round': rounding the scaled columns to rows
+- 'draw': drawing the graph or histogram
+- 'label': surrounding the graph with its labels
+"""
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+# seconds is wall time. input_size and output_size count values, or characters for strings, and are None for
+# iterators. peak_memory is the most memory the stage allocated at once, in bytes, when tracing memory.
+StageTiming = namedtuple('StageTiming', ['stage', 'seconds', 'input_size', 'output_size', 'peak_memory'])
+
+
+def _size(values):
+    '''Number of values, of the last sequence for the (timestamps, values) pairs returned by sorting'''
+    if isinstance(values, tuple) and values and hasattr(values[-1], '__len__'):
+        values = values[-1]
+    return len(values) if hasattr(values, '__len__') else None
+
+
+class StageRecorder(object):
+    """Record a StageTiming for every stage of the renders of an instrumented Grapher.
+
+    Timings are appended to timings, and handed to callback as well when one is given, to export them as metrics.
+    With trace_memory the peak allocation of every stage is measured with tracemalloc, which slows rendering down
+    noticeably. When tracing was already started by the caller, the peak is reset before every stage with
+    tracemalloc.reset_peak, which needs Python 3.9. On older versions the caller's traces are left alone, so a
+    stage reports the peak since tracing started, less the memory traced when the stage started.
+    """
+
+    def __init__(self, callback=None, trace_memory=False):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.timings = []
+
+    def run(self, stage, func, values, *args, **kwargs):
+        '''Run one stage, func(values, *args, **kwargs), and record its timing'''
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self.trace_memory:
+            if started_tracing:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        result = func(values, *args, **kwargs)
+        seconds = time.perf_counter() - start
+
+        peak_memory = None
+        if self.trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+            if started_tracing:
+                tracemalloc.stop()
+        self.record(StageTiming(stage, seconds, _size(values), _size(result), peak_memory))
+        return result
+
+    def record(self, timing):
+        self.timings.append(timing)
+        if self.callback is not None:
+            self.callback(timing)
+
+    def totals(self):
+        '''Return the total seconds spent in each stage'''
+        totals = {}
+        for timing in self.timings:
+            totals[timing.stage] = totals.get(timing.stage, 0) + timing.seconds
+        return totals
+
+    def clear(self):
+        self.timings = []
+
+
+@contextmanager
+def instrumented(grapher, recorder):
+    '''Report the stages of the grapher's renders to recorder within the block, see Grapher.instrumented'''
+    previous, grapher.instrument = grapher.instrument, recorder
+    try:
+        yield recorder
+    finally:
+        grapher.instrument = previous
@@ -0,0 +1,111 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Memory-mapped binary series files.
+
+Series are read through memoryviews over a memory map of the file, so nothing is parsed or copied up front and
+downsampling only touches the pages it reads. Three layouts are supported:
+
+- 'f8': raw little-endian float64 values
+- 'records': little-endian (int64 timestamp, float64 value) records
+- 'npy': NumPy .npy files holding a 1-D array of values, or a (n, 2) array of timestamp, value rows
+"""
+import ast
+import mmap
+import struct
+import sys
+from array import array
+
+FORMATS = ('f8', 'records', 'npy')
+
+_NPY_MAGIC = b'\x93NUMPY'
+# .npy type codes without the byte order, and their memoryview formats
+_NPY_FORMATS = {
+    'f8': 'd', 'f4': 'f',
+    'i8': 'q', 'i4': 'i', 'i2': 'h', 'i1': 'b',
+    'u8': 'Q', 'u4': 'I', 'u2': 'H', 'u1': 'B',
+}
+
+
+class MappedSeries(object):
+    """A series backed by a memory-mapped file.
+
+    values is a memoryview of the values, and timestamps a memoryview of their timestamps, or None for files
+    without timestamps. Close the series, or use it as a context manager, to release the memory map.
+    """
+
+    def __init__(self, path, format=None):
+        format = format or ('npy' if str(path).endswith('.npy') else 'f8')
+        if format not in FORMATS:
+            raise ValueError(f'Unknown series file format {format!r}, expected one of {FORMATS}')
+        with open(path, 'rb') as series_file:
+            self._map = mmap.mmap(series_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._map)
+        self.values = self.timestamps = None
+        try:
+            if format == 'f8':
+                self.values = self._cast(self._buffer, 'd')
+            elif format == 'records':
+                records = self._buffer[:len(self._buffer) - len(self._buffer) % 16]
+                self.timestamps = self._cast(records, 'q')[0::2]
+                self.values = self._cast(records, 'd')[1::2]
+            else:
+                self._map_npy()
+        except Exception:
+            self.close()
+            raise
+
+    def _cast(self, buffer, view_format):
+        '''View little-endian data as view_format, byte swapping a copy on big-endian machines'''
+        buffer = buffer[:len(buffer) - len(buffer) % struct.calcsize(view_format)]
+        if sys.byteorder == 'little':
+            return buffer.cast(view_format)
+        swapped = array(view_format, buffer.tobytes())
+        swapped.byteswap()
+        return memoryview(swapped)
+
+    def _map_npy(self):
+        buffer = self._buffer
+        if buffer[:6].tobytes() != _NPY_MAGIC:
+            raise ValueError('Not a .npy file')
+        if buffer[6] == 1:
+            header_length, = struct.unpack('<H', buffer[8:10])
+            header_start = 10
+        else:
+            header_length, = struct.unpack('<I', buffer[8:12])
+            header_start = 12
+        header = ast.literal_eval(buffer[header_start:header_start + header_length].tobytes().decode('latin1'))
+
+        byte_order, type_code = header['descr'][0], header['descr'][1:]
+        if byte_order == '>' or type_code not in _NPY_FORMATS or header['fortran_order']:
+            raise ValueError(f'Unsupported .npy array {header["descr"]!r}, expected a little-endian number type in C order')
+        shape = header['shape']
+        if len(shape) not in (1, 2) or (len(shape) == 2 and shape[1] != 2):
+            raise ValueError(f'Unsupported .npy shape {shape}, expected (n,) values or (n, 2) timestamp, value rows')
+
+        view_format = _NPY_FORMATS[type_code]
+        data_start = header_start + header_length
+        data = self._cast(buffer[data_start:data_start + shape[0] * len(shape) * struct.calcsize(view_format)], view_format)
+        if len(shape) == 1:
+            self.values = data
+        else:
+            self.timestamps = data[0::2]
+            self.values = data[1::2]
+
+    def close(self):
+        '''Release the views and the memory map'''
+        for view in (self.values, self.timestamps, self._buffer):
+            if view is not None:
+                view.release()
+        self.values = self.timestamps = self._buffer = None
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def map_series(path, format=None):
+    '''Memory-map a series file, the format is 'npy' for files ending in .npy, and 'f8' otherwise'''
+    return MappedSeries(path, format)
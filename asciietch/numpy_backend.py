@@ -0,0 +1,217 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Vectorized versions of the Grapher pipeline stages for NumPy array input.
+
+Every function mirrors the Grapher method of the same name and returns NumPy arrays, so a series can go
+through the whole pipeline without being converted to Python lists. This module requires NumPy, Grapher only
+imports it when it is handed a NumPy array or asked for the numpy backend.
+"""
+from collections.abc import Iterator
+
+import numpy
+
+from asciietch.graph import _SLOPE_CODES
+
+# Character for a point given sign(y_prev - y) + 1 and sign(y_next - y) + 1, see asciietch.graph._get_slope_index
+_SLOPE_CHARACTERS = numpy.frombuffer(_SLOPE_CODES, dtype=numpy.uint8).reshape(3, 3)
+_EMPTY_SPACE = ord(' ')
+_VERTICAL_FILL = ord('|')
+_NEWLINE = ord('\n')
+
+
+def as_array(values):
+    '''Convert array-likes and iterators to a float array, None becomes NaN'''
+    if isinstance(values, Iterator):
+        return numpy.fromiter((numpy.nan if value is None else value for value in values), dtype=float)
+    return numpy.asarray(values, dtype=float)
+
+
+def as_timeseries_array(values_dict):
+    '''Convert a timestamp -> value dictionary to a (n, 2) float array sorted by timestamp'''
+    return sort_timeseries_values(numpy.array(list(values_dict.items()), dtype=float).reshape(-1, 2))
+
+
+def is_timeseries_array(values):
+    '''A (n, 2) array holds timestamp, value rows'''
+    return values.ndim == 2 and values.shape[1] == 2
+
+
+def sort_timeseries_values(values):
+    '''Sort (n, 2) timestamp, value rows by timestamp, skipping the sort if they are already in order'''
+    timestamps = values[:, 0]
+    if numpy.all(timestamps[1:] >= timestamps[:-1]):
+        return values
+    return values[numpy.argsort(timestamps, kind='stable')]
+
+
+def split_timeseries(values, timestamps=None):
+    '''Split (n, 2) timestamp, value rows, or values and their timestamps, into sorted float arrays'''
+    if timestamps is None:
+        values = sort_timeseries_values(values)
+        return values[:, 0], values[:, 1]
+    timestamps = as_array(timestamps)
+    values = as_array(values)
+    if not numpy.all(timestamps[1:] >= timestamps[:-1]):
+        order = numpy.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        values = values[order]
+    return timestamps, values
+
+
+def drop_missing(values):
+    '''Drop NaN values, the array equivalent of dropping None'''
+    if values.dtype == object:
+        values = numpy.array(values.tolist(), dtype=float)
+    if values.dtype.kind == 'f':
+        values = values[~numpy.isnan(values)]
+    return values
+
+
+def _reduce_runs(values, starts, aggregate):
+    '''Reduce the runs of values beginning at each of the sorted, non-empty starts with the aggregate'''
+    ends = numpy.append(starts[1:], len(values))
+    if aggregate == 'mean':
+        return numpy.add.reduceat(values.astype(float, copy=False), starts) / (ends - starts)
+    if aggregate == 'last':
+        return values[ends - 1]
+    lows = numpy.minimum.reduceat(values, starts)
+    highs = numpy.maximum.reduceat(values, starts)
+    if aggregate == 'min':
+        return lows
+    if aggregate == 'max':
+        return highs
+
+    # minmax, order the low and high of every run by where they first occurred
+    run_ids = numpy.repeat(numpy.arange(len(starts)), ends - starts)
+    positions = numpy.arange(len(values))
+    low_positions = numpy.minimum.reduceat(numpy.where(values == lows[run_ids], positions, len(values)), starts)
+    high_positions = numpy.minimum.reduceat(numpy.where(values == highs[run_ids], positions, len(values)), starts)
+    low_first = (low_positions <= high_positions)[:, numpy.newaxis]
+    return numpy.where(low_first, numpy.column_stack((lows, highs)), numpy.column_stack((highs, lows)))
+
+
+def lttb(x_values, y_values, max_width):
+    '''Select max_width points with Largest-Triangle-Three-Buckets, see asciietch.aggregate.lttb'''
+    length = len(y_values)
+    if length <= max_width:
+        return y_values
+    if max_width < 3:
+        return y_values[[0, -1][:max_width]]
+
+    x_values = x_values.astype(float, copy=False)
+    y_values = y_values.astype(float, copy=False)
+    bounds = (numpy.arange(max_width) * ((length - 2) / (max_width - 2))).astype(numpy.intp) + 1
+    bounds[-1] = length
+    selected = numpy.empty(max_width, dtype=numpy.intp)
+    selected[0] = 0
+    selected[-1] = length - 1
+    previous = 0
+    for i in range(max_width - 2):
+        start, end, next_end = bounds[i], bounds[i + 1], bounds[i + 2]
+        next_x = x_values[end:next_end].mean()
+        next_y = y_values[end:next_end].mean()
+        previous_x = x_values[previous]
+        previous_y = y_values[previous]
+        areas = numpy.abs((previous_x - next_x) * (y_values[start:end] - previous_y) - (previous_x - x_values[start:end]) * (next_y - previous_y))
+        previous = selected[i + 1] = start + numpy.argmax(areas)
+    return y_values[selected]
+
+
+def add_to_stats(stats, values):
+    '''Add the values to a RunningStats'''
+    if len(values):
+        mean = values.mean()
+        stats.add_summary(len(values), float(mean), float(numpy.square(values - mean).sum()), values.min(), values.max())
+
+
+def add_to_sketch(sketch, values):
+    '''Add the values to a DistributionSketch, counting the bucket indices of each sign at once'''
+    values = drop_missing(numpy.asarray(values, dtype=float))
+    for counter, magnitudes in ((sketch.positive, values[values > 0]), (sketch.negative, -values[values < 0])):
+        keys, counts = numpy.unique(numpy.ceil(numpy.log(magnitudes) * sketch._multiplier), return_counts=True)
+        counter.update(dict(zip(keys.astype(int).tolist(), counts.tolist())))
+    sketch.zero_count += int(numpy.count_nonzero(values == 0))
+    add_to_stats(sketch.stats, values)
+
+
+def scale_x_values(values, max_width, aggregate='mean', stats=None):
+    '''Scale X values to new width by reducing consecutive runs of values with the aggregate'''
+    if stats is not None:
+        add_to_stats(stats, values)
+    if len(values) <= max_width:
+        return values
+    if aggregate == 'lttb':
+        return lttb(numpy.arange(len(values)), values, max_width)
+    column_count = max_width // 2 if aggregate == 'minmax' else max_width
+    boundaries = numpy.arange(column_count) * len(values) // column_count
+    return _reduce_runs(values, boundaries, aggregate).ravel()
+
+
+def scale_x_values_timestamps(timestamps, values, max_width, aggregate='mean', stats=None):
+    '''Scale values to new width by reducing the values in each time column, the timestamps must be sorted'''
+    timestamps = as_array(timestamps)
+    values = as_array(values)
+    first_timestamp = timestamps[0]
+    last_timestamp = timestamps[-1]
+    present = ~numpy.isnan(values)
+    timestamps = timestamps[present]
+    values = values[present]
+    if stats is not None:
+        add_to_stats(stats, values)
+    if aggregate == 'lttb':
+        return lttb(timestamps, values, max_width)
+
+    column_count = max_width // 2 if aggregate == 'minmax' else max_width
+    step_size = (last_timestamp - first_timestamp) / column_count
+    if step_size:
+        columns = numpy.floor_divide(timestamps - first_timestamp, step_size)
+        columns = numpy.minimum(columns, column_count - 1).astype(numpy.intp)  # Don't go beyond the last column
+    else:
+        columns = numpy.zeros(len(values), dtype=numpy.intp)
+
+    adjusted_values = numpy.zeros((column_count, 2) if aggregate == 'minmax' else column_count)  # 0 if no values
+    if len(values):
+        # The timestamps are sorted so every column is one run of values
+        starts = numpy.flatnonzero(numpy.diff(columns, prepend=-1))
+        adjusted_values[columns[starts]] = _reduce_runs(values, starts, aggregate)
+    return adjusted_values.ravel()
+
+
+def scale_y_values(values, new_max, new_min=0, scale_old_from_zero=True):
+    '''Take values and transmute them into a new range'''
+    y_min_value = 0 if scale_old_from_zero else values.min()
+    y_max_value = values.max()
+    # Prevents division by zero if all values are the same
+    old_range = (y_max_value - y_min_value) or 1
+    new_range = (new_max - new_min)
+    return (((values - y_min_value) * new_range) / old_range) + new_min
+
+
+def round_floats_to_ints(values):
+    '''Round half to even like Python's round()'''
+    return numpy.rint(values).astype(numpy.intp)
+
+
+def get_ascii_field(values):
+    '''Create the field[x][y] representation of an ascii graph as a (width, height) array of character codes'''
+    values = numpy.asarray(values, dtype=numpy.intp)
+    y_prev = numpy.concatenate((values[:1], values[:-1]))
+    y_next = numpy.concatenate((values[1:], values[-1:]))
+
+    # Fill the space strictly between each point and the previous one
+    heights = numpy.arange(values.max() + 1)
+    low = numpy.minimum(values, y_prev)[:, numpy.newaxis]
+    high = numpy.maximum(values, y_prev)[:, numpy.newaxis]
+    field = numpy.where((heights > low) & (heights < high), _VERTICAL_FILL, _EMPTY_SPACE).astype(numpy.uint8)
+
+    field[numpy.arange(len(values)), values] = _SLOPE_CHARACTERS[numpy.sign(y_prev - values) + 1, numpy.sign(y_next - values) + 1]
+    return field
+
+
+def draw_ascii_graph(field):
+    '''Draw graph from a (width, height) array of character codes'''
+    rows = field.T[::-1]
+    lines = numpy.empty((rows.shape[0], rows.shape[1] + 1), dtype=numpy.uint8)
+    lines[:, :-1] = rows
+    lines[:, -1] = _NEWLINE
+    return lines.tobytes()[:-1].decode('ascii')
@@ -0,0 +1,121 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Multi-resolution summaries of a timeseries, for zooming and panning without rescanning the raw values.
+
+Level k of a SeriesPyramid summarises every aligned run of 2 ** k values with its sum, sum of squared
+differences from its mean, minimum and maximum. Any run of values is covered by at most two nodes per level, so
+a column of a graph is summarised in O(log n) whatever its width, and a window of any size is rendered in
+O(max_width * log n).
+"""
+import copy
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import add
+
+from asciietch.aggregate import DEFAULT_AGGREGATE, RunningStats, get_column_count, resolve_aggregate
+from asciietch.graph import Grapher, _find_column_start, _get_window, _get_window_columns, _is_ndarray
+
+PYRAMID_AGGREGATES = ('mean', 'min', 'max', 'last')
+
+
+class SeriesPyramid(object):
+    """Summaries of a timeseries at power of two resolutions.
+
+    Build one from a timestamp -> value dictionary, or from values and their timestamps, and render it, or a
+    window of it returned by zoom, with Grapher.asciigraph, asciihist or asciibraille. Columns are binned like
+    Grapher bins timeseries, so the graphs are the same as graphs of the raw series. None values are dropped.
+    """
+
+    def __init__(self, values, timestamps=None):
+        timestamps, values = Grapher()._split_timeseries(values, timestamps)
+        if _is_ndarray(values):
+            timestamps, values = timestamps.tolist(), values.tolist()
+        present = [value is not None and value == value for value in values]  # Drop None and NaN
+        self.timestamps = array('d', (timestamp for timestamp, keep in zip(timestamps, present) if keep))
+        self.values = array('d', (value for value, keep in zip(values, present) if keep))
+        self.start = self.timestamps[0] if self.timestamps else None
+        self.end = self.timestamps[-1] if self.timestamps else None
+
+        # Level 0 is the values themselves
+        self._sums = [self.values]
+        self._m2s = [array('d', bytes(8 * len(self.values)))]
+        self._lows = [self.values]
+        self._highs = [self.values]
+        count = 1
+        while len(self._sums[-1]) > 1:
+            sums, m2s, lows, highs = self._sums[-1], self._m2s[-1], self._lows[-1], self._highs[-1]
+            # Merge pairs of nodes of count values, see RunningStats.add_summary
+            self._m2s.append(array('d', (m2_a + m2_b + (sum_b - sum_a) ** 2 / (2 * count)
+                                         for m2_a, m2_b, sum_a, sum_b in zip(m2s[0::2], m2s[1::2], sums[0::2], sums[1::2]))))
+            self._sums.append(array('d', map(add, sums[0::2], sums[1::2])))
+            self._lows.append(array('d', map(min, lows[0::2], lows[1::2])))
+            self._highs.append(array('d', map(max, highs[0::2], highs[1::2])))
+            count *= 2
+
+    def __len__(self):
+        '''Number of values in the window'''
+        first, stop = self._get_bounds()
+        return stop - first
+
+    def zoom(self, start=None, end=None):
+        '''Return a window of the series from start to end, sharing the summaries of this one
+
+        A start or end of None keeps the start or end of this window, or takes the other bound when that is outside of
+        this window.
+        '''
+        window = copy.copy(self)
+        window.start, window.end = _get_window((self.start, self.end), start, end)
+        return window
+
+    def _get_bounds(self):
+        '''Indices of the first value in the window and of the first one after it'''
+        return bisect_left(self.timestamps, self.start), bisect_right(self.timestamps, self.end)
+
+    def _summarize(self, start, end, stats=None):
+        '''Sum, minimum and maximum of the values from index start up to end, merging their stats into stats'''
+        total = 0.0
+        low = high = None
+        while start < end:
+            # The largest node starting at start that doesn't go beyond end
+            level = (end - start).bit_length() - 1
+            if start:
+                level = min(level, (start & -start).bit_length() - 1)
+            node = start >> level
+            node_sum = self._sums[level][node]
+            total += node_sum
+            low = self._lows[level][node] if low is None else min(low, self._lows[level][node])
+            high = self._highs[level][node] if high is None else max(high, self._highs[level][node])
+            if stats is not None:
+                count = 1 << level
+                stats.add_summary(count, node_sum / count, self._m2s[level][node], self._lows[level][node], self._highs[level][node])
+            start += 1 << level
+        return total, low, high
+
+    def get_columns(self, max_width, aggregate=DEFAULT_AGGREGATE, label=False, gaps='zero'):
+        '''Summarise the window into at most max_width columns, empty columns are filled like Grapher fills them with gaps'''
+        aggregate = resolve_aggregate(aggregate, max_width)
+        if aggregate not in PYRAMID_AGGREGATES:
+            raise ValueError(f'Unknown aggregate {aggregate!r}, a SeriesPyramid supports {PYRAMID_AGGREGATES}')
+        first, stop = self._get_bounds()
+        column_count = get_column_count(max_width, aggregate)
+        step_size = (self.end - self.start) / column_count
+
+        column_starts = [first]
+        for column in range(1, column_count):
+            column_starts.append(min(_find_column_start(self.timestamps, self.start, step_size, column, column_starts[-1]), stop))
+        column_starts.append(stop)
+
+        stats = RunningStats() if label else None
+        adjusted_values = []
+        for start, end in zip(column_starts, column_starts[1:]):
+            if start == end:
+                adjusted_values.append(None)
+            elif aggregate == 'last':
+                if stats is not None:
+                    self._summarize(start, end, stats)
+                adjusted_values.append(self.values[end - 1])
+            else:
+                total, low, high = self._summarize(start, end, stats)
+                adjusted_values.append(total / (end - start) if aggregate == 'mean' else low if aggregate == 'min' else high)
+
+        return _get_window_columns(adjusted_values, self.start, self.end, gaps, stats)
@@ -0,0 +1,220 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Columns of a timeseries aggregated by several processes in shared memory.
+
+A SharedColumns block divides a fixed time window into columns the way Grapher bins timeseries. Every worker
+process owns a slot of columns, in which it keeps the count, mean, sum of squared differences from the mean,
+minimum and maximum of its values, so workers never write to the same memory and need no locks. Rendering
+merges the slots straight out of the shared block, without pickling any samples between processes.
+
+The block starts with a header of float64 fields: start, end, column count and worker count, followed by the
+slots, worker after worker, of _FIELDS float64 fields per column.
+"""
+import math
+import sys
+from array import array
+from itertools import islice
+
+from asciietch.aggregate import DEFAULT_AGGREGATE, RunningStats, get_column_count, resolve_aggregate
+from asciietch.graph import DEFAULT_MAX_WIDTH, Grapher, _get_window_columns
+
+SHARED_AGGREGATES = ('mean', 'min', 'max')
+_HEADER = 4
+_FIELDS = 5  # count, mean, m2, low, high
+
+
+def _get_shared_memory_class():
+    '''multiprocessing.shared_memory is only available from Python 3.8'''
+    if sys.version_info < (3, 8):
+        raise ImportError('SharedColumns require Python 3.8 or higher for multiprocessing.shared_memory')
+    from multiprocessing.shared_memory import SharedMemory
+
+    return SharedMemory
+
+
+def _open_shared_memory(name):
+    '''Attach to an existing block, leaving its cleanup to the process that created it'''
+    SharedMemory = _get_shared_memory_class()
+
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block with the resource tracker, which would unlink it
+        from multiprocessing import resource_tracker
+
+        memory = SharedMemory(name)
+        resource_tracker.unregister(memory._name, 'shared_memory')
+        return memory
+
+
+class SharedColumns(object):
+    """Per worker column statistics of the time window from start to end, in a multiprocessing shared memory block.
+
+    Create the block once, hand it, or its name, to the workers, which add values to their own slot with add or
+    extend, and render it with any Grapher method. Columns are binned over max_width columns like
+    Grapher.asciigraph bins the window with the aggregate, so the graph is the same as the graph of all the
+    values. Narrower graphs merge neighbouring columns, so they can only be rendered at widths that divide the
+    number of columns, and graphs can't be wider than the block. asciibraille draws two columns per character, so
+    create the block with twice the width of a Braille graph. Pickling a SharedColumns, as multiprocessing does with arguments, attaches to the same block.
+    Close it in every process when done, and unlink it once from the process that created it.
+    """
+
+    def __init__(self, start, end, max_width=None, workers=1, aggregate=DEFAULT_AGGREGATE, name=None):
+        SharedMemory = _get_shared_memory_class()
+
+        if not end > start:
+            raise ValueError(f'The window must end after it starts, not {start!r} to {end!r}')
+        column_count = get_column_count(max_width or DEFAULT_MAX_WIDTH, resolve_aggregate(aggregate, max_width or DEFAULT_MAX_WIDTH))
+        size = 8 * (_HEADER + workers * column_count * _FIELDS)
+        self._memory = SharedMemory(name, create=True, size=size)
+        self._attach()
+        self._fields[:_HEADER] = array('d', (start, end, column_count, workers))
+        self._read_header()
+        self.clear()
+
+    @classmethod
+    def attach(cls, name):
+        '''Attach to a block created by another process'''
+        columns = cls.__new__(cls)
+        columns._memory = _open_shared_memory(name)
+        columns._attach()
+        columns._read_header()
+        return columns
+
+    def _attach(self):
+        self.name = self._memory.name
+        self._fields = self._memory.buf[:self._memory.size // 8 * 8].cast('d')
+
+    def _read_header(self):
+        self.start, self.end = self._fields[0], self._fields[1]
+        self.column_count, self.workers = int(self._fields[2]), int(self._fields[3])
+        self._step_size = (self.end - self.start) / self.column_count
+
+    def __reduce__(self):
+        return SharedColumns.attach, (self.name,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        '''Release this process' view of the block'''
+        if self._memory is not None:
+            self._fields.release()
+            self._memory.close()
+            self._memory = None
+
+    def unlink(self):
+        '''Free the block, once every process is done with it'''
+        SharedMemory = _get_shared_memory_class()
+
+        memory = self._memory or SharedMemory(self.name)
+        memory.unlink()
+        if memory is not self._memory:
+            memory.close()
+
+    def clear(self, worker=None):
+        '''Empty the slot of a worker, or all of them'''
+        empty = _pack([0, 0.0, 0.0, None, None] * self.column_count)
+        for slot in range(self.workers) if worker is None else (worker,):
+            offset = self._get_offset(slot, 0)
+            self._fields[offset:offset + self.column_count * _FIELDS] = empty
+
+    def _get_offset(self, worker, column):
+        if not 0 <= worker < self.workers:
+            raise ValueError(f'Worker {worker!r} is not one of the {self.workers} workers')
+        return _HEADER + (worker * self.column_count + column) * _FIELDS
+
+    def _get_column(self, timestamp):
+        '''The column of a timestamp, None outside of the window, see _find_column_start'''
+        if not self.start <= timestamp <= self.end:
+            return None
+        return min(int((timestamp - self.start) // self._step_size), self.column_count - 1)
+
+    def _load(self, offset):
+        count, mean, m2, low, high = self._fields[offset:offset + _FIELDS]
+        stats = RunningStats()
+        stats.add_summary(int(count), mean, m2, low, high)
+        return stats
+
+    def _store(self, offset, stats):
+        self._fields[offset:offset + _FIELDS] = _pack([stats.count, stats.mean, stats.m2, stats.low, stats.high])
+
+    def add(self, worker, timestamp, value):
+        '''Add a value to the column of its timestamp in the worker's slot, values outside of the window are dropped'''
+        column = self._get_column(timestamp)
+        if column is None or value is None or value != value:
+            return
+        offset = self._get_offset(worker, column)
+        stats = self._load(offset)
+        stats.add(value)
+        self._store(offset, stats)
+
+    def extend(self, worker, values, timestamps=None):
+        '''Add a timestamp -> value dictionary, or values and their timestamps, to the worker's slot
+
+        The values are gathered by column first, and every column is merged into the slot as one run.
+        '''
+        timestamps, values = Grapher()._split_timeseries(values, timestamps)
+        if hasattr(timestamps, 'tolist'):
+            timestamps, values = timestamps.tolist(), values.tolist()
+        runs = {}
+        for timestamp, value in zip(timestamps, values):
+            column = self._get_column(timestamp)
+            if column is not None and value is not None and value == value:
+                runs.setdefault(column, []).append(value)
+        for column, run in runs.items():
+            offset = self._get_offset(worker, column)
+            stats = self._load(offset)
+            stats.add_chunk(run)
+            self._store(offset, stats)
+
+    def get_stats(self):
+        '''Merge the slots of every worker into the RunningStats of each column'''
+        columns = [RunningStats() for _ in range(self.column_count)]
+        for worker in range(self.workers):
+            offset = self._get_offset(worker, 0)
+            slot = self._fields[offset:offset + self.column_count * _FIELDS]
+            for stats, count, mean, m2, low, high in zip(columns, *(islice(slot, field, None, _FIELDS) for field in range(_FIELDS))):
+                stats.add_summary(int(count), mean, m2, low, high)
+        return columns
+
+    def get_columns(self, max_width, aggregate=DEFAULT_AGGREGATE, label=False, gaps='zero'):
+        '''Merge the workers' columns into at most max_width columns, filling empty ones like Grapher does with gaps'''
+        aggregate = resolve_aggregate(aggregate, max_width)
+        if aggregate not in SHARED_AGGREGATES:
+            raise ValueError(f'Unknown aggregate {aggregate!r}, SharedColumns support {SHARED_AGGREGATES}')
+        columns = self.get_stats()
+        column_count = get_column_count(max_width, aggregate)
+        if column_count > self.column_count:
+            raise ValueError(f'SharedColumns of {self.column_count} columns can not be rendered {column_count} columns wide, '
+                             f'create the block with max_width={column_count}')
+        if column_count < self.column_count:
+            # Columns binned by time only merge into the same wider columns when each of these holds a whole number of them
+            if self.column_count % column_count:
+                raise ValueError(f'SharedColumns of {self.column_count} columns can only be rendered {self.column_count} columns wide, '
+                                 f'or a divisor of it, not {column_count}')
+            step = self.column_count // column_count
+            merged = []
+            for first in range(0, self.column_count, step):
+                stats = RunningStats()
+                for column in columns[first:first + step]:
+                    stats.merge(column)
+                merged.append(stats)
+            columns = merged
+
+        adjusted_values = [(stats.mean if aggregate == 'mean' else stats.low if aggregate == 'min' else stats.high) if stats.count else None
+                           for stats in columns]
+        stats = None
+        if label:
+            stats = RunningStats()
+            for column in columns:
+                stats.merge(column)
+        return _get_window_columns(adjusted_values, self.start, self.end, gaps, stats)
+
+
+def _pack(fields):
+    '''Float64 fields to write into the block, None is stored as NaN'''
+    return array('d', (math.nan if field is None else field for field in fields))
@@ -0,0 +1,167 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Mergeable sketches of the distribution of a series, for histograms and quantiles without sorting.
+
+A DistributionSketch counts values in logarithmic buckets, like DDSketch: bucket i holds the values between
+gamma ** (i - 1) and gamma ** i, with gamma = (1 + relative_accuracy) / (1 - relative_accuracy), so every
+quantile it reports is within relative_accuracy of a true value. Negative values are counted in buckets of their
+magnitude. Sketches of the same accuracy are merged by adding up their bucket counts, so shards or processes
+can sketch their own values and be combined before rendering.
+"""
+import math
+from collections import Counter
+from itertools import islice, repeat
+from operator import mul
+
+from asciietch.aggregate import RunningStats
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_QUANTILES = (0.5, 0.99)
+SCALES = ('linear', 'log')
+
+
+class DistributionSketch(object):
+    """Bucket counts and running statistics of a stream of values, see the module docstring.
+
+    Values are added with add or update, None and NaN values are skipped. Sketches are plain objects that pickle,
+    so they can be sent between processes and merged with merge.
+    """
+
+    def __init__(self, values=None, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f'relative_accuracy must be between 0 and 1, not {relative_accuracy!r}')
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self.gamma)
+        self.positive = Counter()  # Bucket index -> count
+        self.negative = Counter()  # Bucket index of the magnitude -> count
+        self.zero_count = 0
+        self.stats = RunningStats()
+        if values is not None:
+            self.update(values)
+
+    def __len__(self):
+        return self.stats.count
+
+    def _key(self, value):
+        '''Index of the bucket of a positive value'''
+        return math.ceil(math.log(value) * self._multiplier)
+
+    def _keys(self, values):
+        '''Bucket indices of positive values, mapped with builtins only to keep the per-value work in C'''
+        return map(math.ceil, map(mul, map(math.log, values), repeat(self._multiplier)))
+
+    def _value(self, key):
+        '''The value representing bucket key, within relative_accuracy of every value in it'''
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value):
+        '''Add a single value'''
+        if value is None or value != value:
+            return
+        if value > 0:
+            self.positive[self._key(value)] += 1
+        elif value < 0:
+            self.negative[self._key(-value)] += 1
+        else:
+            self.zero_count += 1
+        self.stats.add(value)
+
+    def update(self, values, chunksize=4096):
+        '''Add every value of an iterable or NumPy array, iterating over it only once'''
+        from asciietch.graph import _is_ndarray, _numpy_backend
+
+        if _is_ndarray(values):
+            _numpy_backend().add_to_sketch(self, values)
+            return
+        iterator = iter(values)
+        chunk = list(islice(iterator, chunksize))
+        while chunk:
+            chunk = [value for value in chunk if value is not None and value == value]
+            positive = [value for value in chunk if value > 0]
+            negative = [-value for value in chunk if value < 0]
+            self.positive.update(self._keys(positive))
+            self.negative.update(self._keys(negative))
+            self.zero_count += len(chunk) - len(positive) - len(negative)
+            self.stats.add_chunk(chunk)
+            chunk = list(islice(iterator, chunksize))
+
+    def merge(self, other):
+        '''Add the counts of another sketch of the same relative accuracy, and return this sketch'''
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(f'Can not merge sketches of relative accuracy {self.relative_accuracy} and {other.relative_accuracy}')
+        self.positive.update(other.positive)
+        self.negative.update(other.negative)
+        self.zero_count += other.zero_count
+        self.stats.merge(other.stats)
+        return self
+
+    def buckets(self):
+        '''Yield the (value, count) of every non-empty bucket, from the lowest value to the highest'''
+        for value, _, _, count in self._get_buckets():
+            yield value, count
+
+    def _get_buckets(self):
+        '''Yield the (value, lowest value, highest value, count) of every non-empty bucket, from the lowest value to the highest'''
+        for key in sorted(self.negative, reverse=True):
+            yield -self._value(key), -self.gamma ** key, -self.gamma ** (key - 1), self.negative[key]
+        if self.zero_count:
+            yield 0, 0, 0, self.zero_count
+        for key in sorted(self.positive):
+            yield self._value(key), self.gamma ** (key - 1), self.gamma ** key, self.positive[key]
+
+    def quantile(self, q):
+        '''Return the approximate value at quantile q, between 0 and 1'''
+        if not 0 <= q <= 1:
+            raise ValueError(f'Quantiles are between 0 and 1, not {q!r}')
+        if not self.stats.count:
+            raise ValueError('Can not take the quantile of an empty sketch')
+        rank = q * (self.stats.count - 1)
+        seen = 0
+        for value, count in self.buckets():
+            seen += count
+            if seen > rank:
+                break
+        # Bucket values are approximate, the extremes are known exactly
+        return min(max(value, self.stats.low), self.stats.high)
+
+    def _get_position(self, value, bins, scale):
+        '''Position of value in bins, from 0 at the lowest value to bins at the highest'''
+        low, high = self.stats.low, self.stats.high
+        if high <= low:
+            return 0
+        if scale == 'log':
+            return math.log(value / low) / math.log(high / low) * bins
+        return (value - low) / (high - low) * bins
+
+    def get_bin(self, value, bins, scale='linear'):
+        '''Index of the bin value falls into, when the range of the values is split into bins bins'''
+        return min(max(int(self._get_position(value, bins, scale)), 0), bins - 1)
+
+    def get_counts(self, bins, scale='linear'):
+        '''Count the values in bins equal bins spanning the range of the values, on a linear or log scale
+
+        Buckets wider than a bin spread their count over the bins they overlap, in proportion to the overlap, so the
+        counts can be fractions.
+        '''
+        if scale not in SCALES:
+            raise ValueError(f'Unknown scale {scale!r}, expected one of {SCALES}')
+        if not self.stats.count:
+            raise ValueError('Can not bin an empty sketch')
+        if scale == 'log' and self.stats.low <= 0:
+            raise ValueError('A log scaled distribution needs values above 0')
+        low, high = self.stats.low, self.stats.high
+        counts = [0] * bins
+        for _, bucket_low, bucket_high, count in self._get_buckets():
+            # Buckets at the ends reach beyond the lowest and highest values, which are known exactly
+            bucket_low, bucket_high = max(bucket_low, low), min(bucket_high, high)
+            if bucket_high <= bucket_low:
+                counts[self.get_bin(min(bucket_low, high), bins, scale)] += count
+                continue
+            start = self._get_position(bucket_low, bins, scale)
+            end = self._get_position(bucket_high, bins, scale)
+            for bin in range(min(max(int(start), 0), bins - 1), min(int(end), bins - 1) + 1):
+                overlap = min(end, bin + 1) - max(start, bin)
+                if overlap > 0:
+                    counts[bin] += count * overlap / (end - start)
+        return counts
@@ -0,0 +1,136 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import time
+from collections import deque
+
+from asciietch.aggregate import RunningStats
+from asciietch.graph import DEFAULT_MAX_WIDTH, Grapher
+
+STREAMING_AGGREGATES = ('mean', 'min', 'max', 'last')
+
+
+class _Column(RunningStats):
+    '''The running statistics of one column, plus the last value added to it'''
+    __slots__ = ('last',)
+
+    def add(self, value):
+        RunningStats.add(self, value)
+        self.last = value
+
+
+class StreamingGrapher(Grapher):
+    """Graph an unbounded stream of values with a constant cost per frame.
+
+    Only one aggregate per column is kept, in a ring buffer of max_width columns. Pushing a value updates the
+    newest column, or starts a new one and drops the oldest. Rendering rescales the columns and only redraws
+    the columns whose neighbourhood changed since the last frame, so the cost of a frame depends on max_width
+    and max_height, never on how much history was pushed.
+
+    Columns hold points_per_column values each, or when seconds_per_column is given, the values whose timestamps
+    fall into the same slice of time. Time columns without values are drawn at 0, like Grapher does.
+    """
+
+    def __init__(self, max_width=None, max_height=None, points_per_column=1, seconds_per_column=None, aggregate='mean'):
+        if aggregate not in STREAMING_AGGREGATES:
+            raise ValueError(f'Unknown aggregate {aggregate!r}, expected one of {STREAMING_AGGREGATES}')
+        self.max_width = max_width or DEFAULT_MAX_WIDTH
+        self.max_height = max_height
+        self.points_per_column = points_per_column
+        self.seconds_per_column = seconds_per_column
+        self.aggregate = aggregate
+        self._columns = deque(maxlen=self.max_width)
+        self._newest_key = None  # Time slice of the newest column
+        self._rendered_columns = deque(maxlen=self.max_width)  # (y_prev, y, y_next, height) and the drawn column
+
+    def __len__(self):
+        return len(self._columns)
+
+    def _append_column(self, column):
+        if len(self._columns) == self.max_width and self._rendered_columns:
+            self._rendered_columns.popleft()  # Keep the drawn columns aligned with the ring buffer
+        self._columns.append(column)
+
+    def _get_column(self, timestamp):
+        '''Return the column a value with this timestamp belongs to, creating columns as needed'''
+        if self.seconds_per_column is None:
+            if not self._columns or self._columns[-1].count >= self.points_per_column:
+                self._append_column(_Column())
+            return self._columns[-1]
+
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        key = int(timestamp // self.seconds_per_column)
+        if self._newest_key is None or key > self._newest_key:
+            gap = 0 if self._newest_key is None else min(key - self._newest_key - 1, self.max_width)
+            for _ in range(gap):
+                self._append_column(_Column())
+            self._append_column(_Column())
+            self._newest_key = key
+        position = len(self._columns) - 1 - (self._newest_key - key)
+        return self._columns[position] if position >= 0 else None  # Too late to show, it scrolled off the graph
+
+    def push(self, value, timestamp=None):
+        '''Add a value to the graph, None values are skipped'''
+        if value is None:
+            return
+        column = self._get_column(timestamp)
+        if column is not None:
+            column.add(value)
+
+    def extend(self, values, timestamps=None):
+        '''Add several values to the graph, optionally with a timestamp for each of them'''
+        if timestamps is None:
+            for value in values:
+                self.push(value)
+        else:
+            for value, timestamp in zip(values, timestamps):
+                self.push(value, timestamp)
+
+    def _get_column_value(self, column):
+        if not column.count:
+            return 0
+        if self.aggregate == 'mean':
+            return column.mean
+        if self.aggregate == 'min':
+            return column.low
+        if self.aggregate == 'max':
+            return column.high
+        return column.last
+
+    def _draw_column(self, y_prev, y, y_next, height):
+        '''Draw one column of the graph from the bottom up'''
+        return ''.join(self._get_field_column(y_prev, y, y_next, height))
+
+    def render(self, label=False):
+        '''Return the graph of the values currently in the ring buffer'''
+        if not self._columns:
+            return ''
+        column_values = [self._get_column_value(column) for column in self._columns]
+        max_height = self.max_height or min(20, max(column_values))
+        heights = self._scale_y_values(values=column_values, new_min=0, new_max=max_height, scale_old_from_zero=False)
+        heights = self._round_floats_to_ints(values=heights)
+
+        height = max(heights) + 1
+        last = len(heights) - 1
+        drawn_columns = []
+        for x, y in enumerate(heights):
+            key = (heights[x - 1] if x else y, y, heights[x + 1] if x < last else y, height)
+            if x < len(self._rendered_columns) and self._rendered_columns[x][0] == key:
+                drawn_columns.append(self._rendered_columns[x][1])
+                continue
+            drawn_column = self._draw_column(*key)
+            if x < len(self._rendered_columns):
+                self._rendered_columns[x] = (key, drawn_column)
+            else:
+                self._rendered_columns.append((key, drawn_column))
+            drawn_columns.append(drawn_column)
+
+        graph_string = '\n'.join(''.join(row) for row in reversed(list(zip(*drawn_columns))))
+
+        if not label:
+            return graph_string
+        stats = RunningStats()
+        for column in self._columns:
+            stats.merge(column)
+        # Unlike Grapher, a graph of fewer than two values is labelled with a 0 standard deviation
+        stdev = stats.stdev if stats.count > 1 else 0.0
+        return self._surround_with_label(graph_string, self.max_width, stats.high or 0, stats.low or 0, stdev, stats.mean)
@@ -0,0 +1,87 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Render templates, for drawing many graphs with the same settings.
+
+A RenderTemplate is returned by Grapher.compile. The options are validated once, the fill runs of the labels are
+built once and sliced per render, and graphs are drawn into canvases that are kept between renders and blanked with
+a single copy, so a render only allocates what depends on the data.
+"""
+from asciietch.aggregate import DEFAULT_AGGREGATE, GAP_MODES, resolve_aggregate
+from asciietch.graph import BACKENDS, DEFAULT_MAX_WIDTH, _is_ndarray, _is_overlay
+
+TEMPLATE_METHODS = ('asciigraph', 'asciihist', 'asciibraille')
+
+
+class RenderTemplate(object):
+    """Render single series with the fixed settings of a Grapher method, see Grapher.compile.
+
+    Calling the template with values, and optionally their timestamps, length and time window, returns the same
+    string as calling the method with these settings. Templates reuse their canvases, so a template should only
+    be used by one thread at a time.
+    """
+
+    def __init__(self, grapher, method='asciigraph', max_width=None, max_height=None, label=False, aggregate=DEFAULT_AGGREGATE, backend=None,
+                 gaps='zero'):
+        if method not in TEMPLATE_METHODS:
+            raise ValueError(f'Unknown method {method!r}, expected one of {TEMPLATE_METHODS}')
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown backend {backend!r}, expected one of {BACKENDS}')
+        if gaps not in GAP_MODES:
+            raise ValueError(f'Unknown gap mode {gaps!r}, expected one of {GAP_MODES}')
+        self.grapher = grapher
+        self.method = method
+        self.max_width = max_width or DEFAULT_MAX_WIDTH
+        self.max_height = max_height
+        self.label = label
+        self.backend = backend
+        self.gaps = gaps
+        # Braille characters hold two columns each
+        self.column_width = 2 * self.max_width if method == 'asciibraille' else self.max_width
+        self.aggregate = resolve_aggregate(aggregate, self.column_width)
+        self._label_fills = grapher._get_label_fills(self.max_width)
+        self._canvases = {}  # (width, height) -> (canvas, blank canvas)
+
+    def __call__(self, values, timestamps=None, length=None, start=None, end=None):
+        if _is_overlay(values):
+            raise ValueError('Templates render a single series, overlays are drawn with Grapher.asciigraph')
+        grapher = self.grapher
+        columns = grapher._get_columns(values, self.column_width, self.label, self.backend, self.aggregate, timestamps, length, self.gaps,
+                                       start, end)
+        if self.method == 'asciihist':
+            graph_string = grapher._render_hist(columns, self.max_width, False)
+        elif self.method == 'asciibraille':
+            graph_string = self._render_braille(columns)
+        else:
+            graph_string = self._render_graph(columns)
+        if self.label:
+            return grapher._run_stage('label', self._surround_with_label, graph_string, columns)
+        return graph_string
+
+    def _get_canvas(self, size, blank):
+        '''Return the canvas kept for drawings of this size, blanked with a copy of blank, the bytes made by blank(*size)'''
+        if size not in self._canvases:
+            blank_canvas = blank(*size)
+            self._canvases[size] = (bytearray(blank_canvas), blank_canvas)
+        canvas, blank_canvas = self._canvases[size]
+        canvas[:] = blank_canvas
+        return canvas
+
+    def _render_graph(self, columns):
+        '''Draw the graph like Grapher._render_graph, on a canvas kept for graphs of the same size'''
+        heights = self.grapher._get_graph_heights(columns, self.max_height)
+        if _is_ndarray(heights):
+            return self.grapher._run_stage('draw', self.grapher._draw_ascii_rows, heights)
+        canvas = self._get_canvas(self.grapher._get_graph_size(heights), self.grapher._get_blank_canvas)
+        return self.grapher._run_stage('draw', self.grapher._draw_ascii_rows, heights, canvas=canvas)
+
+    def _render_braille(self, columns):
+        '''Draw the graph like Grapher._render_braille, on cells kept for graphs of the same size'''
+        levels = self.grapher._get_braille_levels(columns, self.max_height)
+        cells = self._get_canvas(self.grapher._get_braille_size(levels), lambda width, height: bytes(width * height))
+        return self.grapher._run_stage('draw', self.grapher._draw_braille_rows, levels, cells=cells)
+
+    def _surround_with_label(self, graph_string, columns):
+        '''Surround the graph with the labels of Grapher._surround_with_label, cut from the fill runs built once'''
+        top_label, footer = self.grapher._get_label_lines(self.max_width, columns.upper_value, columns.lower_value, columns.stdev, columns.mean,
+                                                          columns.start_ctime, columns.end_ctime, fills=self._label_fills)
+        return ''.join((top_label, '\n', graph_string, footer))
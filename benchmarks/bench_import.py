@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Measure how long importing asciietch modules takes, with python -X importtime in fresh interpreters.
+
+Usage: python benchmarks/bench_import.py [--modules asciietch.graph asciietch.cli] [--repeat 20] [--max-ms 15]
+
+Exits with status 1 when the median import time of a module is above --max-ms.
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+_IMPORT_TIME = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def import_time(module):
+    '''Return the cumulative microseconds spent importing module, and the modules it imported'''
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], stderr=subprocess.PIPE, check=True,
+                            universal_newlines=True).stderr
+    imported = []
+    for line in output.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match:
+            imported.append(match.group(3))
+            if match.group(3) == module and not match.group(2):
+                return int(match.group(1)), imported
+    return 0, imported  # Already imported by the interpreter at startup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', nargs='+', default=['asciietch.graph', 'asciietch.cli'])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-ms', type=float, help='fail when a median import time is above this')
+    parser.add_argument('--verbose', action='store_true', help='list the modules each import pulls in')
+    args = parser.parse_args()
+
+    status = 0
+    print(f'{"module":<24} {"median":>9} {"best":>9}')
+    for module in args.modules:
+        times = []
+        for _ in range(args.repeat):
+            microseconds, imported = import_time(module)
+            times.append(microseconds / 1000)
+        median = statistics.median(times)
+        print(f'{module:<24} {median:>7.2f}ms {min(times):>7.2f}ms')
+        if args.verbose:
+            package = module.split('.')[0]
+            print('    ' + ' '.join(imported[imported.index(package):] if package in imported else imported))
+        if args.max_ms is not None and median > args.max_ms:
+            print(f'{module} takes {median:.2f}ms to import, more than {args.max_ms}ms', file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Measure how Grapher.render_many scales with the number of worker processes.
+
+Usage: python benchmarks/bench_render_many.py [--series 2000] [--points 5000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import time
+
+from asciietch.graph import Grapher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--series', type=int, default=2000)
+    parser.add_argument('--points', type=int, default=5000)
+    parser.add_argument('--chunksize', type=int, default=16)
+    cpu_count = os.cpu_count() or 1
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1))))
+    args = parser.parse_args()
+
+    g = Grapher()
+    series = [[random.random() * 100 for _ in range(args.points)] for _ in range(args.series)]
+    print(f'{args.series} series of {args.points} points on {cpu_count} cores')
+    print(f'{"workers":>8} {"seconds":>9} {"speedup":>8}')
+    single = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        for _ in g.render_many(series, max_workers=workers, chunksize=args.chunksize, max_width=100, max_height=10, label=True):
+            pass
+        elapsed = time.perf_counter() - start
+        single = single or elapsed
+        print(f'{workers:>8} {elapsed:>8.3f}s {single / elapsed:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
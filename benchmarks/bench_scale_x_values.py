@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Compare the single-pass X downsampler against the previous slice + statistics.mean implementation.
+
+Usage: python benchmarks/bench_scale_x_values.py [--sizes 10000 1000000 10000000] [--width 180]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from asciietch.graph import Grapher
+
+
+def scale_x_values_slice_mean(values, max_width):
+    '''The previous implementation, kept here as the benchmark baseline'''
+    adjusted_values = list(values)
+    if len(adjusted_values) > max_width:
+
+        def get_position(current_pos):
+            return len(adjusted_values) * current_pos // max_width
+
+        adjusted_values = [statistics.mean(adjusted_values[get_position(i):get_position(i + 1)]) for i in range(max_width)]
+
+    return adjusted_values
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 4, 10 ** 6, 10 ** 7])
+    parser.add_argument('--width', type=int, default=180)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    g = Grapher()
+    print(f'{"points":>10} {"slice+mean":>12} {"single-pass":>12} {"speedup":>8}')
+    for size in args.sizes:
+        values = [random.random() * 100 for _ in range(size)]
+        # The baseline is very slow on large inputs, one run is plenty to show the difference
+        old_time, old_result = best_of(lambda: scale_x_values_slice_mean(values, args.width), 1 if size > 10 ** 6 else args.repeat)
+        new_time, new_result = best_of(lambda: g._scale_x_values(values, args.width), args.repeat)
+        assert all(abs(a - b) <= 1e-9 * max(1.0, abs(a)) for a, b in zip(old_result, new_result))
+        print(f'{size:>10} {old_time:>11.4f}s {new_time:>11.4f}s {old_time / new_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
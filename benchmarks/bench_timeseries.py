@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Compare graphing a day of per-second timeseries data against the previous sort + per-point binning.
+
+Usage: python benchmarks/bench_timeseries.py [--points 86400] [--width 180]
+"""
+import argparse
+import random
+import statistics
+import time
+from array import array
+
+from asciietch.graph import Grapher
+
+
+def scale_x_values_timestamps_per_point(values_dict, max_width):
+    '''The previous implementation, kept here as the benchmark baseline'''
+    values = sorted(values_dict.items(), key=lambda x: x[0])
+    first_timestamp = float(values[0][0])
+    last_timestamp = float(values[-1][0])
+    step_size = (last_timestamp - first_timestamp) / max_width
+
+    values_by_column = [[] for _ in range(max_width)]
+    for timestamp, value in values:
+        if value is None:
+            continue
+        timestamp = float(timestamp)
+        column = (timestamp - first_timestamp) // step_size
+        column = int(min(column, max_width - 1))
+        values_by_column[column].append(value)
+
+    return [statistics.mean(values) if values else 0 for values in values_by_column]
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, default=86400)
+    parser.add_argument('--width', type=int, default=180)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    g = Grapher()
+    start = 1512431401
+    timestamps = array('d', range(start, start + args.points))
+    values = [random.random() * 100 for _ in range(args.points)]
+    values_dict = {str(int(timestamp)): value for timestamp, value in zip(timestamps, values)}
+
+    baseline = best_of(lambda: scale_x_values_timestamps_per_point(values_dict, args.width), args.repeat)
+    from_dict = best_of(lambda: g.asciigraph(values_dict, max_width=args.width), args.repeat)
+    from_arrays = best_of(lambda: g.asciigraph(values, max_width=args.width, timestamps=timestamps), args.repeat)
+    print(f'{args.points} points, {args.width} columns')
+    print(f'previous binning only:        {baseline:.4f}s')
+    print(f'asciigraph, string key dict:  {from_dict:.4f}s')
+    print(f'asciigraph, sorted arrays:    {from_arrays:.4f}s')
+
+
+if __name__ == '__main__':
+    main()
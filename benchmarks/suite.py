@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+"""Benchmark every stage of the rendering pipeline, and compare runs to catch regressions.
+
+Usage:
+    python benchmarks/suite.py run [--output results.json] [--filter asciigraph] [--repeat 5]
+    python benchmarks/suite.py compare baseline.json results.json [--threshold 0.1]
+
+run times each case and optionally stores the results as JSON. compare prints the change of every case found in
+both files, and exits with status 1 when one got slower than the baseline by more than the threshold, so a
+change can be checked against a baseline taken before it.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+from asciietch.cache import RenderCache
+from asciietch.graph import Grapher
+
+WIDTH = 180
+HEIGHT = 20
+CASES = {}
+
+
+def case(name):
+    '''Register a benchmark case, the decorated function sets up the inputs and returns the callable to time'''
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def random_walk(size, seed=0):
+    generator = random.Random(seed)
+    values = []
+    value = 0
+    for _ in range(size):
+        value += generator.randint(-1, 1)
+        values.append(value)
+    return values
+
+
+def timeseries(size, seed=0):
+    '''A timestamp -> value dictionary of one value a minute'''
+    return {1500000000 + 60 * i: value for i, value in enumerate(random_walk(size, seed))}
+
+
+def scaled(values):
+    '''Values as they are handed to the drawing stages'''
+    g = Grapher()
+    adjusted_values = g._scale_y_values(g._scale_x_values(values, WIDTH), new_min=0, new_max=HEIGHT, scale_old_from_zero=False)
+    return g._round_floats_to_ints(adjusted_values)
+
+
+for size, size_name in ((10 ** 3, '1k'), (10 ** 5, '100k'), (10 ** 6, '1m')):
+    @case(f'scale_x_values/list-{size_name}')
+    def _(size=size):
+        values = random_walk(size)
+        return lambda: Grapher()._scale_x_values(values, WIDTH)
+
+    @case(f'asciigraph/list-{size_name}')
+    def _(size=size):
+        values = random_walk(size)
+        return lambda: Grapher().asciigraph(values, max_height=HEIGHT, max_width=WIDTH)
+
+    @case(f'cached-asciigraph/hit-list-{size_name}')
+    def _(size=size):
+        values = random_walk(size)
+        g = Grapher(cache=RenderCache())
+        g.asciigraph(values, max_height=HEIGHT, max_width=WIDTH)
+        return lambda: g.asciigraph(values, max_height=HEIGHT, max_width=WIDTH)
+
+for size, size_name in ((10 ** 3, '1k'), (10 ** 5, '100k')):
+    @case(f'scale_x_values_timestamps/dict-{size_name}')
+    def _(size=size):
+        g = Grapher()
+        timestamps, values = g._split_timeseries(timeseries(size))
+        return lambda: g._scale_x_values_timestamps(values, WIDTH, timestamps=timestamps)
+
+    @case(f'asciigraph/dict-{size_name}')
+    def _(size=size):
+        values = timeseries(size)
+        return lambda: Grapher().asciigraph(values, max_height=HEIGHT, max_width=WIDTH)
+
+    @case(f'asciigraph/labelled-dict-{size_name}')
+    def _(size=size):
+        values = timeseries(size)
+        return lambda: Grapher().asciigraph(values, max_height=HEIGHT, max_width=WIDTH, label=True)
+
+    @case(f'cached-asciigraph/hit-labelled-dict-{size_name}')
+    def _(size=size):
+        values = timeseries(size)
+        g = Grapher(cache=RenderCache())
+        g.asciigraph(values, max_height=HEIGHT, max_width=WIDTH, label=True)
+        return lambda: g.asciigraph(values, max_height=HEIGHT, max_width=WIDTH, label=True)
+
+    @case(f'compiled-asciigraph/labelled-dict-{size_name}')
+    def _(size=size):
+        values = timeseries(size)
+        template = Grapher().compile(max_height=HEIGHT, max_width=WIDTH, label=True)
+        return lambda: template(values)
+
+    @case(f'asciihist/list-{size_name}')
+    def _(size=size):
+        values = random_walk(size)
+        return lambda: Grapher().asciihist(values, max_width=WIDTH)
+
+    @case(f'asciidist/list-{size_name}')
+    def _(size=size):
+        values = random_walk(size)
+        return lambda: Grapher().asciidist(values, max_width=WIDTH)
+
+    @case(f'asciibraille/list-{size_name}')
+    def _(size=size):
+        values = random_walk(size)
+        return lambda: Grapher().asciibraille(values, max_height=HEIGHT, max_width=WIDTH)
+
+
+@case('scale_y_values/list-180')
+def _():
+    values = Grapher()._scale_x_values(random_walk(10 ** 4), WIDTH)
+    return lambda: Grapher()._scale_y_values(values, new_min=0, new_max=HEIGHT, scale_old_from_zero=False)
+
+
+@case('get_ascii_field/list-180')
+def _():
+    values = scaled(random_walk(10 ** 4))
+    return lambda: Grapher()._get_ascii_field(values)
+
+
+@case('draw_ascii_graph/list-180')
+def _():
+    field = Grapher()._get_ascii_field(scaled(random_walk(10 ** 4)))
+    return lambda: Grapher()._draw_ascii_graph(field)
+
+
+@case('draw_ascii_rows/list-180')
+def _():
+    values = scaled(random_walk(10 ** 4))
+    return lambda: Grapher()._draw_ascii_rows(values)
+
+
+def time_case(func, repeat):
+    '''Return the best and median seconds per call, and the number of calls per measurement'''
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    times = sorted(total / loops for total in timer.repeat(repeat=repeat, number=loops))
+    return {'best': times[0], 'median': times[len(times) // 2], 'loops': loops, 'repeat': repeat}
+
+
+def run(args):
+    results = {}
+    print(f'{"case":<40} {"best":>12} {"median":>12}')
+    for name, setup in CASES.items():
+        if args.filter and not any(pattern in name for pattern in args.filter):
+            continue
+        result = results[name] = time_case(setup(), args.repeat)
+        print(f'{name:<40} {result["best"] * 1e3:>10.3f}ms {result["median"] * 1e3:>10.3f}ms')
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.time(),
+            'results': results,
+        }
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    return 0
+
+
+def compare(args):
+    with open(args.baseline) as baseline_file, open(args.results) as results_file:
+        baseline = json.load(baseline_file)['results']
+        results = json.load(results_file)['results']
+
+    regressions = []
+    print(f'{"case":<40} {"baseline":>12} {"results":>12} {"change":>8}')
+    for name in sorted(baseline.keys() & results.keys()):
+        before = baseline[name]['best']
+        after = results[name]['best']
+        change = after / before - 1
+        flag = ''
+        if change > args.threshold:
+            regressions.append(name)
+            flag = '  REGRESSED'
+        print(f'{name:<40} {before * 1e3:>10.3f}ms {after * 1e3:>10.3f}ms {change:>+7.1%}{flag}')
+    for name in sorted(baseline.keys() - results.keys()):
+        print(f'{name:<40} missing from {args.results}')
+
+    if regressions:
+        print(f'{len(regressions)} case(s) regressed by more than {args.threshold:.0%}', file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help='time the benchmark cases')
+    run_parser.add_argument('--output', help='store the results as JSON in this file')
+    run_parser.add_argument('--filter', nargs='+', help='only run the cases whose name contains one of these')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.set_defaults(handler=run)
+    compare_parser = subparsers.add_parser('compare', help='compare results against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='largest slowdown allowed, 0.1 is 10%%')
+    compare_parser.set_defaults(handler=compare)
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
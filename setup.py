@@ -83,9 +83,14 @@ setup(
     license='License :: OSI Approved :: BSD License',
     packages=find_packages(),
     install_requires=[
-        'parsedatetime==2.4',
         'setuptools>=30',
     ],
+    entry_points={
+        'console_scripts': ['asciietch = asciietch.cli:main'],
+    },
+    extras_require={
+        'numpy': ['numpy'],
+    },
     tests_require=[
         'flake8>=3.5.0',
         'pytest>=3.0.6',
@@ -0,0 +1,120 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import statistics
+from array import array
+
+import pytest
+from asciietch.aggregate import RunningStats, downsample, fill_gaps, lttb, reduce_runs, resolve_aggregate
+from asciietch.graph import Grapher
+
+
+def test_column_aggregates():
+    values = [3, 1, 2, 9, 5, 4, 0, 8, 6]
+    assert downsample(values, 3, 'mean') == [2, 6, 14 / 3]
+    assert downsample(values, 3, 'min') == [1, 4, 0]
+    assert downsample(values, 3, 'max') == [3, 9, 8]
+    assert downsample(values, 3, 'last') == [2, 4, 6]
+
+
+def test_minmax_keeps_order_of_occurrence():
+    values = [3, 1, 2, 9, 5, 4, 0, 8, 6, 7]
+    # Two columns of 5 values, each emitting its low and high in the order they occurred
+    assert downsample(values, 4, 'minmax') == [1, 9, 0, 8]
+    assert downsample(values, 5, 'minmax') == [1, 9, 0, 8]
+    assert resolve_aggregate('minmax', 1) == 'max'
+
+
+def test_lttb_keeps_spike_and_endpoints():
+    values = [0] * 50 + [100] + [0] * 49
+    sampled = lttb(range(len(values)), values, 10)
+    assert len(sampled) == 10
+    assert 100 in sampled
+    assert downsample(values, 10, 'mean').count(0) == 9
+
+
+def test_reduce_runs_with_empty_runs():
+    assert reduce_runs([1, 3, 5], [2, 0, 1], 'mean') == [2, 0, 5]
+    assert reduce_runs([4, 1], [2, 0], 'minmax') == [4, 1, 0, 0]
+    assert reduce_runs([1, 3, 5], [2, 0, 1], 'mean', empty=None) == [2, None, 5]
+
+
+def test_reduce_runs_skips_nan():
+    nan = float('nan')
+    values = array('d', [1, nan, 3, nan, nan, 4, 2])
+    assert reduce_runs(values, [3, 2, 2], skip_nan=True) == [2, 0, 3]
+    assert reduce_runs(values, [3, 2, 2], 'minmax', empty=None, skip_nan=True) == [1, 3, None, None, 4, 2]
+    stats = RunningStats()
+    assert downsample(memoryview(values), 3, 'max', stats, skip_nan=True) == [1, 3, 4]
+    assert (stats.count, stats.low, stats.high) == (4, 1, 4)
+
+
+def test_fill_gaps():
+    columns = [None, 2, None, None, 5]
+    assert fill_gaps(columns, 'zero') == [0, 2, 0, 0, 5]
+    assert fill_gaps(columns, 'blank') == columns
+    assert fill_gaps(columns, 'carry') == [None, 2, 2, 2, 5]
+    with pytest.raises(ValueError):
+        fill_gaps(columns, 'interpolate')
+
+
+def test_unknown_aggregate():
+    with pytest.raises(ValueError):
+        Grapher().asciigraph([1, 2, 3], aggregate='median')
+
+
+def test_aggregates_fit_max_width():
+    g = Grapher()
+    values = [(x * 7919) % 37 for x in range(1000)]
+    ts = 1512431401
+    time_data = {ts + x: value for x, value in enumerate(values)}
+    for aggregate in ('mean', 'min', 'max', 'last', 'minmax', 'lttb'):
+        for width in (1, 2, 7, 60):
+            assert len(g._scale_x_values(values, max_width=width, aggregate=aggregate)) <= width
+            assert len(g._scale_x_values_timestamps(list(time_data.items()), max_width=width, aggregate=aggregate)) <= width
+
+
+def test_labels_report_real_extremes():
+    g = Grapher()
+    values = [1] * 99 + [500]
+    top_line = g.asciigraph(values, max_width=10, label=True).splitlines()[0]
+    assert 'Upper value: 500.00' in top_line
+    top_line = g.asciihist(dict(enumerate(values)), max_width=10, label=True).splitlines()[0]
+    assert 'Upper value: 500.00' in top_line
+
+
+def test_running_stats_match_statistics():
+    values = [((x * 7919) % 101) / 7 + 1e6 for x in range(10000)]
+    single = RunningStats()
+    for value in values:
+        single.add(value)
+    chunked = RunningStats()
+    chunked.update(iter(values), chunksize=333)
+    for stats in (single, chunked):
+        assert stats.count == len(values)
+        assert stats.low == min(values) and stats.high == max(values)
+        assert abs(stats.mean - statistics.mean(values)) < 1e-6
+        assert abs(stats.stdev - statistics.stdev(values)) < 1e-6
+
+    merged = RunningStats()
+    halves = RunningStats(), RunningStats()
+    halves[0].update(values[:3000])
+    halves[1].update(values[3000:])
+    merged.merge(halves[0])
+    merged.merge(halves[1])
+    assert abs(merged.stdev - statistics.stdev(values)) < 1e-6
+
+
+def test_running_stats_gathered_while_downsampling():
+    values = [(x * 7919) % 37 for x in range(1000)]
+    for aggregate in ('mean', 'minmax', 'lttb'):
+        stats = RunningStats()
+        downsample(values, 50, aggregate, stats)
+        assert stats.count == len(values)
+        assert abs(stats.stdev - statistics.stdev(values)) < 1e-9
+
+
+def test_running_stats_need_two_values_for_variance():
+    stats = RunningStats()
+    stats.add(1)
+    with pytest.raises(statistics.StatisticsError):
+        stats.stdev
@@ -0,0 +1,81 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asciietch.graph import Grapher
+
+
+def run(coroutine):
+    '''Run a coroutine on a new event loop, like asyncio.run does from Python 3.7'''
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def samples(values):
+    for value in values:
+        yield value
+
+
+def test_async_render_matches_sync():
+    g = Grapher()
+    values = list(range(100))
+    assert run(g.aasciigraph(values, max_height=5)) == g.asciigraph(values, max_height=5)
+    assert run(g.aasciihist(values, max_width=20)) == g.asciihist(values, max_width=20)
+    assert run(g.aasciigraph(samples(values), max_height=5)) == g.asciigraph(values, max_height=5)
+
+    pairs = [(i * 60, i % 5) for i in range(100)]
+    assert run(g.aasciigraph(samples(pairs), max_width=20)) == g.asciigraph(dict(pairs), max_width=20)
+
+
+def test_large_renders_run_in_the_executor():
+    g = Grapher()
+    g.inline_render_size = 10
+    threads = []
+    original = g.asciigraph
+
+    def asciigraph(values, **options):
+        threads.append(threading.current_thread())
+        return original(values, **options)
+
+    g.asciigraph = asciigraph
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        run(g.aasciigraph(list(range(5)), executor=executor))
+        run(g.aasciigraph(list(range(100)), executor=executor))
+        run(g.aasciigraph(iter(range(5)), executor=executor))
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+    assert threads[2] is not threading.main_thread()
+
+
+def test_concurrent_renders_are_limited():
+    g = Grapher()
+    g.inline_render_size = 0
+    g.max_concurrent_renders = 2
+    running = []
+    peak = []
+    lock = threading.Lock()
+    original = g.asciigraph
+
+    def asciigraph(values, **options):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        try:
+            return original(values, **options)
+        finally:
+            with lock:
+                running.pop()
+
+    g.asciigraph = asciigraph
+
+    async def render_all():
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return await asyncio.gather(*(g.aasciigraph(list(range(2000)), executor=executor) for _ in range(8)))
+
+    assert len(set(run(render_all()))) == 1
+    assert max(peak) <= 2
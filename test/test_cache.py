@@ -0,0 +1,73 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+from array import array
+from asciietch.cache import RenderCache, fingerprint
+from asciietch.graph import Grapher
+
+values = [(x * 7919) % 37 for x in range(1000)]
+
+
+def test_cached_render_matches_uncached_render():
+    cache = RenderCache()
+    g = Grapher(cache=cache)
+    expected = Grapher().asciigraph(values, max_height=10, max_width=50, label=True)
+    assert g.asciigraph(values, max_height=10, max_width=50, label=True) == expected
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert g.asciigraph(list(values), max_height=10, max_width=50, label=True) == expected
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert g.asciihist(values, max_width=50) == Grapher().asciihist(values, max_width=50)
+
+
+def test_columns_are_shared_across_heights():
+    g = Grapher(cache=RenderCache())
+    g.asciigraph(values, max_height=10, max_width=50)
+    scaled = []
+    scale_x_values = g._scale_x_values
+    g._scale_x_values = lambda *args, **kwargs: scaled.append(args) or scale_x_values(*args, **kwargs)
+    assert g.asciigraph(values, max_height=5, max_width=50) == Grapher().asciigraph(values, max_height=5, max_width=50)
+    assert not scaled
+
+
+def test_changed_series_misses():
+    cache = RenderCache()
+    g = Grapher(cache=cache)
+    changed = list(values)
+    g.asciigraph(changed, max_width=50)
+    changed[500] = 1000
+    assert g.asciigraph(changed, max_width=50) == Grapher().asciigraph(changed, max_width=50)
+    assert cache.hits == 0
+
+
+def test_lru_eviction_and_ttl():
+    now = [0]
+    cache = RenderCache(maxsize=2, ttl=10, timer=lambda: now[0])
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert len(cache) == 2
+    now[0] = 11
+    assert cache.get('a') is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0
+
+
+def test_fingerprint():
+    assert fingerprint(values) == fingerprint(list(values))
+    assert fingerprint(values) != fingerprint(values[:-1] + [1000])
+    assert fingerprint(array('d', values)) != fingerprint(array('d', values), timestamps=range(1000))
+    assert fingerprint(iter(values)) is None
+    assert fingerprint([lambda: 1]) is None
+    assert fingerprint([1, None, 2]) != fingerprint([1, 2, None])
+    assert fingerprint({'1': 2}) != fingerprint({'2': 1})
+    # Keys hold a digest of the series, not the series
+    assert len(repr(fingerprint(values, timestamps=dict.fromkeys(range(1000), 1.5)))) < 300
+
+
+def test_colliding_hashes_miss():
+    # hash(-1) == hash(-2) in CPython
+    g = Grapher(cache=RenderCache())
+    g.asciigraph([-1, 5, 3, 0], label=True)
+    assert g.asciigraph([-2, 5, 3, 0], label=True) == Grapher().asciigraph([-2, 5, 3, 0], label=True)
@@ -0,0 +1,54 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+from io import StringIO
+
+import pytest
+
+from asciietch.cli import main, read_series
+from asciietch.graph import Grapher
+
+
+def test_read_series():
+    values, timestamps = read_series([StringIO('1\n\n# comment\n2.5\n3\n')], chunk_bytes=2)
+    assert list(values) == [1, 2.5, 3]
+    assert timestamps is None
+
+    values, timestamps = read_series([StringIO('10 1\n20 2\n'), StringIO('30 3\n')])
+    assert list(values) == [1, 2, 3]
+    assert list(timestamps) == [10, 20, 30]
+
+
+def test_main_graph():
+    values = list(range(100))
+    stdout = StringIO()
+    assert main(['--height', '5', '--width', '20'], stdin=StringIO('\n'.join(map(str, values))), stdout=stdout) == 0
+    assert stdout.getvalue() == Grapher().asciigraph(values, max_height=5, max_width=20) + '\n'
+
+    stdout = StringIO()
+    assert main(['--hist', '--width', '20'], stdin=StringIO('\n'.join(map(str, values))), stdout=stdout) == 0
+    assert stdout.getvalue() == Grapher().asciihist(values, max_width=20) + '\n'
+
+
+def test_main_errors(capsys):
+    assert main([], stdin=StringIO('1\nnot a number\n')) == 1
+    assert 'not a number' in capsys.readouterr().err
+    assert main([], stdin=StringIO('1\n10 2\n')) == 1
+    assert 'mixed' in capsys.readouterr().err
+    assert main([], stdin=StringIO('')) == 1
+
+
+def test_main_follow():
+    values = [1, 5, 2, 8, 3]
+    stdout = StringIO()
+    assert main(['--follow', '--fps', '100', '--height', '4'], stdin=StringIO('\n'.join(map(str, values))), stdout=stdout) == 0
+    frames = stdout.getvalue().split('\x1b[J')
+    graph, rate = frames[-1].rstrip('\n').rsplit('\n', 1)
+    assert graph == Grapher().asciigraph(values, max_height=4)
+    assert rate.startswith('5 values in ')
+
+
+@pytest.mark.parametrize('option', [['--hist'], ['--braille'], ['--dist', 'log'], ['--gaps', 'blank'], ['--rate']])
+def test_main_follow_rejects_unsupported_options(option, capsys):
+    with pytest.raises(SystemExit):
+        main(['--follow'] + option, stdin=StringIO('1\n'))
+    assert option[0] in capsys.readouterr().err
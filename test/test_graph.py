@@ -1,7 +1,15 @@
 # Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
 # See LICENSE in the project root for license information.
+import io
 import sys
 import logging
+import statistics
+import subprocess
+import tracemalloc
+from array import array
+
+import pytest
+
 from asciietch.graph import Grapher
 
 logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
@@ -65,6 +73,19 @@ def test_ascii_compress_values():
     assert g._scale_x_values(values=values, max_width=3) == [2, 5.5, 9.5]
 
 
+def test_ascii_compress_values_matches_mean():
+    g = Grapher()
+    values = [(x * 7919) % 101 / 3 for x in range(1000)]
+    scaled = g._scale_x_values(values=values, max_width=7)
+    expected = [statistics.mean(values[1000 * i // 7:1000 * (i + 1) // 7]) for i in range(7)]
+    assert len(scaled) == len(expected)
+    for actual, wanted in zip(scaled, expected):
+        assert abs(actual - wanted) < 1e-9
+
+    # Iterables without a length are materialised first
+    assert g._scale_x_values(values=iter(range(0, 10)), max_width=5) == [0.5, 2.5, 4.5, 6.5, 8.5]
+
+
 def test_sort_timeseries_values():
     g = Grapher()
     time_data = {
@@ -127,6 +148,16 @@ def test_draw_ascii_graph():
         assert len(line) == 8
 
 
+def test_draw_ascii_rows_matches_field():
+    g = Grapher()
+    for values in ([0], [3, 3, 3], [0, 1, 2, 2, 1, 0, 3, 0], [(x * 7919) % 13 for x in range(200)]):
+        assert g._draw_ascii_rows(values) == g._draw_ascii_graph(g._get_ascii_field(values))
+    # Heights beyond a 16 bit integer
+    graph_string = g.asciigraph([0, 40000], max_height=40000)
+    assert graph_string.count('\n') == 40000
+    assert graph_string == g._draw_ascii_graph(g._get_ascii_field([0, 40000]))
+
+
 def test_draw_graph_with_labels():
     g = Grapher()
     values = [x % 3 for x in range(100)]
@@ -177,6 +208,252 @@ def test_timestamp_as_string_with_none_values():
     assert result[0] > 4.5 and result[0] < 5
 
 
+def test_timestamps_given_separately():
+    g = Grapher()
+    ts = 1512431401
+    time_data = {str(ts + v * 3): None if v % 11 == 0 else v % 10 for v in range(500)}
+    expected = g.asciigraph(time_data, max_height=10, max_width=40, label=True)
+
+    timestamps = array('d', (ts + v * 3 for v in range(500)))
+    values = list(time_data.values())
+    assert g.asciigraph(values, max_height=10, max_width=40, label=True, timestamps=timestamps) == expected
+    assert g.asciihist(values, max_width=40, timestamps=timestamps) == g.asciihist(time_data, max_width=40)
+
+    # Unsorted input is sorted first
+    shuffled = sorted(time_data.items(), key=lambda item: hash(item[0]))
+    assert g.asciigraph(dict(shuffled), max_height=10, max_width=40, label=True) == expected
+
+
+def test_gaps_in_timeseries():
+    g = Grapher()
+    time_data = {0: 1, 1: 2, 2: 3, 9: 3, 10: 5}
+    assert g._get_columns(time_data, 10).values == [1, 2, 3, 0, 0, 0, 0, 0, 0, 4]
+    assert g._get_columns(time_data, 10, gaps='blank').values == [1, 2, 3, None, None, None, None, None, None, 4]
+    assert g._get_columns(time_data, 10, gaps='carry').values == [1, 2, 3, 3, 3, 3, 3, 3, 3, 4]
+
+    # Gaps are left blank instead of dropping to zero
+    assert g.asciigraph(time_data, max_width=10, gaps='blank') == '         -\n  -       \n  |       \n /        \n/         '
+    assert g.asciihist(time_data, max_width=10, gaps='blank') == '▁▃▆      █'
+    assert g.asciihist(time_data, max_width=10, gaps='carry') == '▁▃▆▆▆▆▆▆▆█'
+    assert g.asciigraph(time_data, max_width=10, gaps='blank', label=True)
+    with pytest.raises(ValueError):
+        g.asciigraph(time_data, gaps='interpolate')
+
+
+def test_time_window():
+    g = Grapher()
+    ts = 1512431401
+    time_data = {ts + v * 3: v % 10 for v in range(500)}
+    start, end = ts + 90, ts + 900
+    window = {timestamp: value for timestamp, value in time_data.items() if start <= timestamp <= end}
+    assert g.asciigraph(time_data, max_width=40, label=True, start=start, end=end) == g.asciigraph(window, max_width=40, label=True)
+
+    # A window wider than the data leaves the columns without values as gaps
+    columns = g._get_columns({10: 1, 20: 2}, 4, gaps='blank', start=0, end=40)
+    assert columns.values == [None, 1, 2, None]
+
+
+def test_empty_and_inverted_time_windows():
+    g = Grapher()
+    time_data = {10: 1, 20: 2}
+    # Windows without values are all gaps, spanning the bounds that were given
+    for window in ({'end': 5}, {'start': 30}, {'start': 30, 'end': 40}):
+        assert g._get_columns(time_data, 4, gaps='blank', **window).values == [None] * 4
+        assert g.asciigraph(time_data, max_width=4, gaps='blank', **window) == '    '
+    assert g._get_columns(time_data, 4, start=30).values == [0] * 4
+    lines = g.asciigraph(time_data, max_width=60, label=True, start=30, end=40).splitlines()
+    assert lines[0].startswith('Upper value: n/a ')
+    assert lines[-1] == g._get_start_and_end_ctimes((30, 40))[0] + ' ' * 13 + g._get_start_and_end_ctimes((30, 40))[1]
+
+    with pytest.raises(ValueError):
+        g.asciigraph(time_data, start=20, end=10)
+    # Overlays span all the series, windows and gap modes aren't supported
+    with pytest.raises(ValueError):
+        g.asciigraph([time_data, time_data], start=10)
+    with pytest.raises(ValueError):
+        g.asciigraph([time_data, time_data], gaps='blank')
+
+
+def test_split_timeseries_skips_sort_when_in_order():
+    g = Grapher()
+    timestamps = array('d', range(100))
+    values = list(range(100))
+    split_timestamps, split_values = g._split_timeseries(values, timestamps)
+    assert split_timestamps is timestamps
+    assert split_values is values
+
+    split_timestamps, split_values = g._split_timeseries({'3': 'c', '1': 'a', '2': 'b'})
+    assert split_timestamps == [1.0, 2.0, 3.0]
+    assert split_values == ['a', 'b', 'c']
+
+
+def test_render_many_keeps_order():
+    g = Grapher()
+    series = [[(x * step) % 11 for x in range(200)] for step in range(1, 40)]
+    expected = [g.asciigraph(values, max_height=5, max_width=30) for values in series]
+    assert list(g.render_many(iter(series), max_width=30, max_height=5, max_workers=1)) == expected
+    assert list(g.render_many(iter(series), max_width=30, max_height=5, max_workers=2, chunksize=3)) == expected
+
+    expected = [g.asciihist(values, max_width=30) for values in series]
+    assert list(g.render_many(series, method='asciihist', max_width=30, max_workers=2, chunksize=5)) == expected
+
+
+def test_iterators_are_downsampled_as_they_are_read():
+    g = Grapher()
+    values = [None if x % 97 == 0 else (x * 7919) % 37 for x in range(10000)]
+    # Columns are laid out by position before None values are dropped
+    columns = [[value for value in values[len(values) * i // 40:len(values) * (i + 1) // 40] if value is not None] for i in range(40)]
+    reducers = {'mean': statistics.mean, 'min': min, 'max': max, 'last': lambda column: column[-1]}
+    for aggregate, reducer in reducers.items():
+        streamed = g._scale_x_values(iter(values), max_width=40, aggregate=aggregate, length=len(values))
+        expected = [reducer(column) for column in columns]
+        assert len(streamed) == len(expected)
+        for actual, wanted in zip(streamed, expected):
+            assert abs(actual - wanted) < 1e-9
+    assert len(g._scale_x_values(iter(values), max_width=40, aggregate='minmax', length=len(values))) == 40
+
+    # The length is hinted by map objects over sized iterables, not by generators
+    labelled = g.asciigraph((value for value in values), max_height=10, max_width=40, label=True, length=len(values))
+    assert labelled.splitlines()[0].startswith('Upper value: 36.00')
+    assert g.asciihist(map(float, range(1000)), max_width=40) == g.asciihist(list(map(float, range(1000))), max_width=40)
+
+
+def test_iterator_length_mismatch():
+    g = Grapher()
+    # Ran out early, the missing columns are dropped
+    assert g._scale_x_values(iter(range(10)), max_width=5, length=20) == [1.5, 5.5, 8.5]
+    # Longer than the length, the rest goes into the last column
+    assert g._scale_x_values(iter(range(12)), max_width=5, length=10) == [0.5, 2.5, 4.5, 6.5, 9.5]
+
+
+def test_iterator_memory_is_bounded():
+    g = Grapher()
+    tracemalloc.start()
+    g.asciigraph((x % 1000 for x in range(300000)), max_height=10, max_width=100, label=True, length=300000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 4 * 1024 * 1024
+
+
+def test_overlay_shares_the_y_axis():
+    g = Grapher()
+    assert g.asciigraph([[0, 1, 2], [2, 1, 0]], max_height=2) == '+ *\n + \n* +'
+    assert g.asciigraph([[0, 2], [4]], max_height=4, glyphs='ab') == 'b \n  \n a\n a\na '
+    with pytest.raises(ValueError):
+        g.asciigraph([[1, 2], [2, 1], [3, 3]], glyphs='ab')
+
+
+def test_overlay_columns_match_single_series():
+    g = Grapher()
+    a = [x % 17 for x in range(1000)]
+    b = [x % 23 for x in range(1000)]
+    columns = g._get_overlay_columns([a, b], max_width=50, label=True)
+    assert columns.values == [g._get_columns(a, 50).values, g._get_columns(b, 50).values]
+    assert (columns.upper_value, columns.lower_value) == (22, 0)
+
+    # Shared timestamps are sorted once for every series
+    timestamps = [5, 1, 3, 2, 4]
+    columns = g._get_overlay_columns([[5, 1, 3, 2, 4], [50, 10, 30, 20, 40]], max_width=5, timestamps=timestamps)
+    assert columns.values == [[1, 2, 3, 4, 5], [10, 20, 30, 40, 50]]
+    assert columns.values == g._get_overlay_columns([dict(zip(timestamps, [5, 1, 3, 2, 4])), dict(zip(timestamps, [50, 10, 30, 20, 40]))],
+                                                    max_width=5).values
+
+
+def test_overlay_errors():
+    g = Grapher()
+    with pytest.raises(ValueError):
+        g.asciigraph([[1, 2], {1: 2}])
+    with pytest.raises(ValueError):
+        g.asciigraph([[1, 2], [2, 1]], aggregate='lttb')
+
+
+def test_braille_dots():
+    g = Grapher()
+    assert g.asciibraille([0, 7, 0], max_height=2) == '\u28b8\u2846\n\u2878\u2847'
+    # Eight levels rising by one dot per value
+    assert g.asciibraille(list(range(8)), max_height=2) == '\u2800\u2800\u2860\u280a\n\u2860\u280a\u2800\u2800'
+
+
+def test_braille_matches_dot_by_dot_drawing():
+    g = Grapher()
+    values = [(x * 7919) % 41 for x in range(97)]
+    height = max(values) // 4 + 1
+    width = (len(values) + 1) // 2
+    cells = [[0] * width for _ in range(height)]
+    for x, y in enumerate(values):
+        y_prev = values[x - 1] if x else y
+        levels = range(y_prev + 1, y + 1) if y > y_prev else range(y, y_prev) if y < y_prev else (y,)
+        for level in levels:
+            row = 4 * height - 1 - level
+            cells[row // 4][x // 2] |= (0x01, 0x02, 0x04, 0x40)[row % 4] if x % 2 == 0 else (0x08, 0x10, 0x20, 0x80)[row % 4]
+    expected = '\n'.join(''.join(chr(0x2800 + cell) for cell in row) for row in cells)
+    assert g._draw_braille_rows(values) == expected
+
+
+def test_braille_shows_two_values_per_character():
+    g = Grapher()
+    graph = g.asciibraille([x % 10 for x in range(1000)], max_height=5, max_width=40, label=True)
+    lines = graph.splitlines()
+    assert len(lines) == 5 + 2
+    assert all(len(line) == 40 for line in lines[1:-1])
+
+
+class RecordingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+        return super().write(text)
+
+
+@pytest.mark.parametrize('method', ['asciigraph', 'asciihist', 'asciibraille'])
+def test_render_to_writes_the_render(method):
+    g = Grapher()
+    values = [(x * 7919) % 37 for x in range(1000)]
+    for label in (False, True):
+        expected = getattr(g, method)(values, max_width=40, label=label)
+        text = io.StringIO()
+        assert g.render_to(text, values, method=method, max_width=40, label=label) == len(expected)
+        assert text.getvalue() == expected
+        binary = io.BytesIO()
+        g.render_to(binary, values, method=method, max_width=40, label=label, buffer_size=256)
+        assert binary.getvalue() == expected.encode('utf-8')
+
+
+def test_render_to_writes_rows_as_they_are_drawn():
+    g = Grapher()
+    values = [(x * 7919) % 37 for x in range(1000)]
+    stream = RecordingStream()
+    g.render_to(stream, values, max_height=10, max_width=40, label=True)
+    assert stream.writes[0].startswith('Upper value: ')
+    assert len(stream.writes) == 11 + 2
+
+    stream = RecordingStream()
+    g.render_to(stream, values, max_height=10, max_width=40, label=True, buffer_size=200)
+    assert len(stream.writes) < 11
+    assert stream.getvalue() == g.asciigraph(values, max_height=10, max_width=40, label=True)
+
+
+def test_import_is_lazy():
+    """Modules only some renders need are imported when they are first used"""
+    code = 'import sys, asciietch.graph; print(" ".join(sorted(set(sys.modules) & {"random", "datetime", "hashlib", "asyncio", "numpy"})))'
+    result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    assert result.stdout.strip() == ''
+
+
+def test_functional_api():
+    import asciietch
+    from asciietch.graph import asciibraille, asciigraph, asciihist
+
+    values = [1, 5, 2, 8, 3]
+    assert asciigraph(values, max_height=4) == Grapher().asciigraph(values, max_height=4)
+    assert asciihist(values) == Grapher().asciihist(values)
+    assert asciibraille(values) == Grapher().asciibraille(values)
+    assert asciietch.asciigraph is asciigraph
+
+
 class TestAsciiHist:
     g = Grapher()
     values = [1, 2, 3, 4]
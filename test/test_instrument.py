@@ -0,0 +1,57 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import tracemalloc
+
+from asciietch.cache import RenderCache
+from asciietch.graph import Grapher
+from asciietch.instrument import StageRecorder
+
+
+def test_stages_are_recorded():
+    g = Grapher()
+    values = {i * 60: i % 7 for i in range(1000)}
+    exported = []
+    with g.instrumented(callback=exported.append) as recorder:
+        graph = g.asciigraph(values, max_height=5, max_width=50, label=True)
+    assert graph == Grapher().asciigraph(values, max_height=5, max_width=50, label=True)
+    assert [timing.stage for timing in recorder.timings] == ['sort', 'scale_x', 'scale_y', 'round', 'draw', 'label']
+    assert exported == recorder.timings
+    assert g.instrument is None
+
+    sort, scale_x = recorder.timings[:2]
+    assert (sort.input_size, sort.output_size) == (1000, 1000)
+    assert (scale_x.input_size, scale_x.output_size) == (1000, 50)
+    assert all(timing.seconds >= 0 and timing.peak_memory is None for timing in recorder.timings)
+    assert set(recorder.totals()) == {'sort', 'scale_x', 'scale_y', 'round', 'draw', 'label'}
+
+
+def test_hist_and_memory():
+    recorder = StageRecorder(trace_memory=True)
+    g = Grapher(instrument=recorder)
+    g.asciihist(list(range(10000)), max_width=20)
+    assert [timing.stage for timing in recorder.timings] == ['scale_x', 'scale_y', 'round', 'draw']
+    assert all(timing.peak_memory >= 0 for timing in recorder.timings)
+    assert recorder.timings[-1].output_size == 20
+
+
+def test_memory_tracing_of_the_caller_is_kept():
+    tracemalloc.start()
+    try:
+        kept = [object() for _ in range(1000)]
+        recorder = StageRecorder(trace_memory=True)
+        Grapher(instrument=recorder).asciihist(list(range(10000)), max_width=20)
+        assert tracemalloc.is_tracing()
+        assert all(timing.peak_memory >= 0 for timing in recorder.timings)
+        # The caller's traces weren't thrown away by restarting the tracing
+        assert tracemalloc.get_object_traceback(kept[0]) is not None
+    finally:
+        tracemalloc.stop()
+
+
+def test_cached_renders_skip_the_stages():
+    recorder = StageRecorder()
+    g = Grapher(cache=RenderCache(), instrument=recorder)
+    g.asciigraph([1, 2, 3])
+    recorder.clear()
+    g.asciigraph([1, 2, 3])
+    assert recorder.timings == []
@@ -0,0 +1,75 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import mmap
+import struct
+from array import array
+
+import pytest
+from asciietch.graph import Grapher
+from asciietch.mapped import map_series
+
+values = [float((x * 7919) % 37) for x in range(1000)]
+timestamps = [1512431401 + 3 * x for x in range(1000)]
+
+
+def test_raw_float64(tmp_path):
+    path = tmp_path / 'series.f8'
+    with path.open('wb') as series_file:
+        array('d', values).tofile(series_file)
+    with map_series(path) as series:
+        assert isinstance(series.values, memoryview)
+        assert isinstance(series.values.obj, mmap.mmap)
+        assert list(series.values) == values
+        assert series.timestamps is None
+    g = Grapher()
+    assert g.render_file(path, max_height=10, max_width=50, label=True) == g.asciigraph(values, max_height=10, max_width=50, label=True)
+
+
+def test_records(tmp_path):
+    path = tmp_path / 'series.bin'
+    path.write_bytes(b''.join(struct.pack('<qd', timestamp, value) for timestamp, value in zip(timestamps, values)))
+    with map_series(path, 'records') as series:
+        assert list(series.timestamps) == timestamps
+        assert list(series.values) == values
+    g = Grapher()
+    expected = g.asciihist(dict(zip(timestamps, values)), max_width=50, label=True)
+    assert g.render_file(path, 'records', method='asciihist', max_width=50, label=True) == expected
+
+
+def test_npy(tmp_path):
+    numpy = pytest.importorskip('numpy')
+    g = Grapher()
+    path = tmp_path / 'values.npy'
+    numpy.save(path, numpy.array(values))
+    assert g.render_file(path, max_height=10, max_width=50) == g.asciigraph(values, max_height=10, max_width=50)
+
+    path = tmp_path / 'rows.npy'
+    numpy.save(path, numpy.array(list(zip(timestamps, values)), dtype='<i8'))
+    with map_series(path) as series:
+        assert list(series.timestamps) == timestamps
+        assert list(series.values) == [int(value) for value in values]
+
+
+def test_unsupported_files(tmp_path):
+    path = tmp_path / 'series.f8'
+    path.write_bytes(bytes(16))
+    with pytest.raises(ValueError):
+        map_series(path, 'csv')
+    with pytest.raises(ValueError):
+        map_series(path, 'npy')
+
+
+def test_nan_values_are_dropped(tmp_path):
+    path = tmp_path / 'series.f8'
+    with path.open('wb') as series_file:
+        array('d', [1, float('nan'), 3, 2] * 100).tofile(series_file)
+    g = Grapher()
+    expected = g.asciigraph([1, 3, 2] * 100, max_height=10, max_width=50, label=True)
+    assert g.render_file(path, max_height=10, max_width=50, label=True) == expected
+    assert g.render_file(path, max_height=10, max_width=500) == g.asciigraph([1, 3, 2] * 100, max_height=10, max_width=500)
+
+    path = tmp_path / 'series.bin'
+    path.write_bytes(b''.join(struct.pack('<qd', timestamp, value if x % 4 != 1 else float('nan'))
+                              for x, (timestamp, value) in enumerate(zip(timestamps, values))))
+    expected = g.asciigraph({timestamp: value for x, (timestamp, value) in enumerate(zip(timestamps, values)) if x % 4 != 1}, max_width=50, label=True)
+    assert g.render_file(path, 'records', max_width=50, label=True) == expected
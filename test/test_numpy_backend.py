@@ -0,0 +1,67 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import pytest
+from asciietch.graph import Grapher
+
+numpy = pytest.importorskip('numpy')
+
+# Integer valued series keep the sums exact, so both backends must produce identical output
+values = [(x * 7919) % 37 for x in range(1000)]
+
+
+def test_numpy_graph_matches_python_graph():
+    g = Grapher()
+    for max_width in (10, 100, 180, 2000):
+        expected = g.asciigraph(values, max_height=15, max_width=max_width, label=True)
+        assert g.asciigraph(numpy.array(values), max_height=15, max_width=max_width, label=True) == expected
+        assert g.asciigraph(values, max_height=15, max_width=max_width, label=True, backend='numpy') == expected
+
+
+def test_numpy_hist_matches_python_hist():
+    g = Grapher()
+    for max_width in (10, 180, 2000):
+        expected = g.asciihist(values, max_width=max_width, label=True)
+        assert g.asciihist(numpy.array(values), max_width=max_width, label=True) == expected
+
+
+def test_numpy_timeseries_matches_python_timeseries():
+    g = Grapher()
+    ts = 1512431401
+    time_data = {str(ts + 7 * (x * 31 % 200)): None if x % 13 == 0 else x % 10 for x in range(200)}
+    expected = g.asciigraph(time_data, max_height=10, max_width=50, label=True)
+    assert g.asciigraph(time_data, max_height=10, max_width=50, label=True, backend='numpy') == expected
+
+    rows = numpy.array([(float(timestamp), numpy.nan if value is None else value) for timestamp, value in time_data.items()])
+    assert g.asciigraph(rows, max_height=10, max_width=50, label=True) == expected
+    assert g.asciihist(rows, max_width=50) == g.asciihist(time_data, max_width=50)
+
+
+def test_numpy_nan_values_are_dropped():
+    g = Grapher()
+    with_nan = numpy.array([1.0, numpy.nan, 2.0, 3.0])
+    assert g.asciigraph(with_nan) == g.asciigraph([1, None, 2, 3])
+    assert g.asciigraph(with_nan, backend='python') == g.asciigraph([1, None, 2, 3])
+
+
+def test_numpy_ascii_field_matches_python_field():
+    g = Grapher()
+    heights = [0, 1, 2, 2, 1, 0, 3, 0, 5, 5, 4]
+    field = g._get_ascii_field(numpy.array(heights))
+    assert g._draw_ascii_graph(field) == g._draw_ascii_graph(g._get_ascii_field(heights))
+    assert chr(field[0][0]) == '/'
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        Grapher().asciigraph(values, backend='fortran')
+
+
+def test_numpy_aggregates_match_python_aggregates():
+    g = Grapher()
+    ts = 1512431401
+    time_data = {ts + x: x % 17 for x in range(1000)}
+    for aggregate in ('mean', 'min', 'max', 'last', 'minmax', 'lttb'):
+        expected = g.asciigraph(values, max_height=15, max_width=60, aggregate=aggregate)
+        assert g.asciigraph(numpy.array(values), max_height=15, max_width=60, aggregate=aggregate) == expected
+        expected = g.asciigraph(time_data, max_height=15, max_width=60, aggregate=aggregate)
+        assert g.asciigraph(time_data, max_height=15, max_width=60, aggregate=aggregate, backend='numpy') == expected
@@ -0,0 +1,65 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import statistics
+
+import pytest
+
+from asciietch.graph import Grapher
+from asciietch.pyramid import SeriesPyramid
+
+
+def make_series(size=1000):
+    return {1500000000 + 60 * i: (i * 7919) % 101 for i in range(size)}
+
+
+@pytest.mark.parametrize('aggregate', ['mean', 'min', 'max', 'last'])
+def test_columns_match_raw_series(aggregate):
+    g = Grapher()
+    values = make_series()
+    pyramid = SeriesPyramid(values)
+    for max_width in (1, 7, 100, 2000):
+        assert g._get_columns(pyramid, max_width, aggregate=aggregate).values == g._get_columns(values, max_width, aggregate=aggregate).values
+    assert g.asciigraph(pyramid, max_height=10, max_width=60, label=True) == g.asciigraph(values, max_height=10, max_width=60, label=True)
+
+
+def test_zoom_matches_raw_window():
+    g = Grapher()
+    values = make_series()
+    pyramid = SeriesPyramid(list(values.values()), timestamps=list(values))
+    start, end = 1500000000 + 60 * 123, 1500000000 + 60 * 456
+    window = {timestamp: value for timestamp, value in values.items() if start <= timestamp <= end}
+    zoomed = pyramid.zoom(start, end)
+    assert len(zoomed) == len(window)
+    assert g._get_columns(zoomed, 50, aggregate='max').values == g._get_columns(window, 50, aggregate='max').values
+
+    columns = g._get_columns(zoomed, 50, label=True)
+    assert (columns.upper_value, columns.lower_value) == (max(window.values()), min(window.values()))
+    assert columns.stdev == pytest.approx(statistics.stdev(window.values()))
+    assert columns.mean == pytest.approx(statistics.mean(window.values()))
+    # Zooming returns a new window, the pyramid still covers the whole series
+    assert len(pyramid) == len(values)
+
+    # Windows without values are all gaps, like windows of the raw series
+    after = max(values) + 60
+    assert g.asciigraph(pyramid, max_width=50, label=True, start=after) == g.asciigraph(values, max_width=50, label=True, start=after)
+    with pytest.raises(ValueError):
+        pyramid.zoom(end, start)
+
+
+def test_gaps_match_raw_series():
+    g = Grapher()
+    values = {timestamp: value for timestamp, value in make_series().items() if not 1500000000 + 60 * 300 < timestamp < 1500000000 + 60 * 500}
+    pyramid = SeriesPyramid(values)
+    for gaps in ('blank', 'carry'):
+        assert g._get_columns(pyramid, 100, gaps=gaps).values == g._get_columns(values, 100, gaps=gaps).values
+    assert None in g._get_columns(pyramid, 100, gaps='blank').values
+    start, end = 1500000000 + 60 * 200, 1500000000 + 60 * 600
+    assert g.asciigraph(pyramid, max_width=50, gaps='blank', start=start, end=end) == g.asciigraph(values, max_width=50, gaps='blank', start=start, end=end)
+
+
+def test_missing_values_are_dropped():
+    values = {1: 1, 2: None, 3: 3, 4: float('nan'), 5: 5}
+    pyramid = SeriesPyramid(values)
+    assert list(pyramid.values) == [1, 3, 5]
+    with pytest.raises(ValueError):
+        pyramid.get_columns(10, aggregate='lttb')
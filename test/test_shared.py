@@ -0,0 +1,85 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import multiprocessing
+import random
+
+import pytest
+
+from asciietch.graph import Grapher
+
+pytest.importorskip('multiprocessing.shared_memory')  # Python 3.8 or higher
+
+from asciietch.shared import SharedColumns  # noqa: E402
+
+START = 1500000000
+END = START + 600
+
+
+def make_series(seed, size=2000):
+    generator = random.Random(seed)
+    return {START + generator.random() * 600: generator.randint(0, 100) for _ in range(size)}
+
+
+def add_series(columns, worker, seed):
+    columns.extend(worker, make_series(seed))
+    columns.close()
+
+
+@pytest.fixture
+def shared():
+    columns = SharedColumns(START, END, max_width=60, workers=4)
+    yield columns
+    columns.unlink()
+    columns.close()
+
+
+def test_workers_aggregate_into_shared_columns(shared):
+    workers = [multiprocessing.Process(target=add_series, args=(shared, worker, worker)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+
+    g = Grapher()
+    combined = {timestamp: value for worker in range(4) for timestamp, value in make_series(worker).items()}
+    for aggregate in ('mean', 'min', 'max'):
+        columns = g._get_columns(shared, 60, aggregate=aggregate, label=True)
+        expected = g._get_columns(combined, 60, aggregate=aggregate, label=True, start=START, end=END)
+        assert columns.values == pytest.approx(expected.values)
+        assert (columns.upper_value, columns.lower_value) == (expected.upper_value, expected.lower_value)
+        assert columns.stdev == pytest.approx(expected.stdev)
+    expected = g.asciigraph(combined, max_height=10, max_width=60, label=True, start=START, end=END)
+    assert g.asciigraph(shared, max_height=10, max_width=60, label=True) == expected
+
+
+def test_add_and_clear(shared):
+    attached = SharedColumns.attach(shared.name)
+    attached.add(1, START + 5, 3)
+    attached.add(2, START + 5, 7)
+    attached.add(2, END + 5, 100)  # Outside of the window
+    attached.close()
+    g = Grapher()
+    assert g._get_columns(shared, 60, gaps='blank').values[:2] == [5, None]
+    assert g._get_columns(shared, 60, aggregate='max').values[0] == 7
+    # Fewer columns merge neighbouring ones
+    assert g._get_columns(shared, 30, gaps='blank').values[:2] == [5, None]
+    # Widths that don't divide the columns would merge columns of different time spans
+    with pytest.raises(ValueError):
+        g._get_columns(shared, 25)
+    # Graphs wider than the block, such as Braille graphs of as many characters, would be drawn from fewer columns
+    with pytest.raises(ValueError):
+        g._get_columns(shared, 120)
+    with pytest.raises(ValueError):
+        g.asciibraille(shared, max_width=60)
+    assert g.asciibraille(shared, max_width=30, max_height=2) == g.asciibraille(
+        {START + 5: 3, START + 5.5: 7}, max_width=30, max_height=2, start=START, end=END)
+
+    shared.clear(2)
+    assert g._get_columns(shared, 60).values[0] == 3
+    with pytest.raises(ValueError):
+        shared.add(4, START, 1)
+    with pytest.raises(ValueError):
+        g.asciigraph(shared, aggregate='last')
+    with pytest.raises(ValueError):
+        g.asciigraph(shared, start=START)
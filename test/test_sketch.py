@@ -0,0 +1,86 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import pickle
+import random
+
+import pytest
+
+from asciietch.graph import Grapher
+from asciietch.sketch import DistributionSketch
+
+
+def make_values(size=20000, seed=0):
+    generator = random.Random(seed)
+    return [generator.lognormvariate(3, 0.7) for _ in range(size)]
+
+
+def test_quantiles_are_within_relative_accuracy():
+    values = make_values()
+    ordered = sorted(values)
+    sketch = DistributionSketch(values, relative_accuracy=0.01)
+    assert len(sketch) == len(values)
+    for q in (0, 0.25, 0.5, 0.9, 0.99, 1):
+        expected = ordered[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.02)
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+    with pytest.raises(ValueError):
+        DistributionSketch().quantile(0.5)
+
+
+def test_merged_sketches_match_one_sketch():
+    values = make_values()
+    whole = DistributionSketch(values)
+    shards = [pickle.loads(pickle.dumps(DistributionSketch(values[start:start + 5000]))) for start in range(0, len(values), 5000)]
+    merged = DistributionSketch()
+    for shard in shards:
+        merged.merge(shard)
+    assert merged.positive == whole.positive
+    assert merged.get_counts(50) == whole.get_counts(50)
+    assert merged.stats.stdev == pytest.approx(whole.stats.stdev)
+    with pytest.raises(ValueError):
+        merged.merge(DistributionSketch(relative_accuracy=0.05))
+
+
+def test_negative_zero_and_missing_values():
+    sketch = DistributionSketch([-10, -1, 0, None, float('nan'), 1, 10])
+    assert len(sketch) == 5
+    assert [count for _, count in sketch.buckets()] == [1, 1, 1, 1, 1]
+    assert sketch.quantile(0.5) == 0
+    assert sketch.quantile(0) == pytest.approx(-10, rel=0.01)
+    assert sketch.get_counts(2) == [2, 3]
+    with pytest.raises(ValueError):
+        sketch.get_counts(2, scale='log')
+
+
+def test_numpy_values_are_sketched_like_lists():
+    numpy = pytest.importorskip('numpy')
+    values = make_values() + [0, -5]
+    sketch = DistributionSketch(numpy.array(values + [float('nan')]))
+    expected = DistributionSketch(values)
+    assert (sketch.positive, sketch.negative, sketch.zero_count) == (expected.positive, expected.negative, expected.zero_count)
+    assert sketch.quantile(0.99) == expected.quantile(0.99)
+
+
+def test_asciidist():
+    g = Grapher()
+    values = [1] * 10 + [2] * 5 + [10]
+    # Bars count the values in each bin, empty bins are blank
+    assert g.asciidist(values, max_width=10) == '█▅       ▂'
+    assert g.asciidist(DistributionSketch(values), max_width=10) == g.asciidist(iter(values), max_width=10)
+
+    lines = g.asciidist(make_values(), max_width=60, label=True, quantiles=(0.5, 0.99)).splitlines()
+    assert len(lines[1]) == 60
+    assert lines[2].count('^') == 2
+    assert lines[-1].startswith('p50: ') and ' p99: ' in lines[-1]
+    assert g.asciidist(make_values(), max_width=60, scale='log') != g.asciidist(make_values(), max_width=60)
+
+
+def test_linear_bins_split_wide_buckets():
+    generator = random.Random(0)
+    values = [generator.uniform(1, 1000) for _ in range(100000)]
+    # Buckets near 1000 are about 20 wide, wider than the bins of 10, and are spread over the bins they overlap
+    counts = DistributionSketch(values).get_counts(100)
+    assert sum(counts) == pytest.approx(len(values))
+    assert min(counts) > 0.8 * max(counts)
+    assert ' ' not in Grapher().asciidist(values, max_width=100)
@@ -0,0 +1,71 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import pytest
+from asciietch.graph import Grapher
+from asciietch.stream import StreamingGrapher
+
+values = [(x * 7919) % 37 for x in range(500)]
+
+
+def test_streaming_graph_matches_graph_of_window():
+    g = Grapher()
+    sg = StreamingGrapher(max_width=40, max_height=10)
+    for i, value in enumerate(values):
+        sg.push(value)
+        if i % 37 == 0:
+            window = values[max(0, i + 1 - 40):i + 1]
+            assert sg.render() == g.asciigraph(window, max_height=10, max_width=40)
+    assert len(sg) == 40
+
+
+def test_streaming_columns_aggregate_points():
+    g = Grapher()
+    for aggregate in ('mean', 'min', 'max', 'last'):
+        sg = StreamingGrapher(max_width=25, max_height=8, points_per_column=20, aggregate=aggregate)
+        sg.extend(values)
+        assert sg.render() == g.asciigraph(values, max_height=8, max_width=25, aggregate=aggregate)
+
+
+def test_streaming_only_redraws_changed_columns():
+    sg = StreamingGrapher(max_width=50, max_height=10)
+    sg.extend([0, 10] * 100)
+    sg.render()
+    drawn = []
+    draw_column = sg._draw_column
+    sg._draw_column = lambda *key: drawn.append(key) or draw_column(*key)
+    sg.extend([0, 10])
+    sg.render()
+    # The scale didn't change, so only the first column, whose previous neighbour scrolled away, the previously
+    # newest column, which now has a next neighbour, and the two new columns are redrawn
+    assert len(drawn) == 4
+
+
+def test_streaming_time_columns():
+    g = Grapher()
+    sg = StreamingGrapher(max_width=10, max_height=5, seconds_per_column=60)
+    for minute in range(20):
+        if minute == 15:
+            continue  # A gap is drawn at 0
+        for second in range(0, 60, 15):
+            sg.push(minute % 4 + 1, timestamp=minute * 60 + second)
+    expected = [minute % 4 + 1 if minute != 15 else 0 for minute in range(10, 20)]
+    assert sg.render() == g.asciigraph(expected, max_height=5, max_width=10)
+
+    # Late values update their column if it is still visible
+    sg.push(100, timestamp=15 * 60)
+    sg.push(100, timestamp=0)
+    assert 'Upper value: 100.00' in sg.render(label=True)
+
+
+def test_streaming_label():
+    sg = StreamingGrapher(max_width=80, max_height=5)
+    sg.extend([1, 2, 3, 4])
+    top_line, *_, bottom_line = sg.render(label=True).splitlines()
+    assert 'Upper value: 4.00' in top_line
+    assert 'Mean: 2.50' in bottom_line
+    assert 'Std Dev: 1.29' in bottom_line
+
+
+def test_streaming_unknown_aggregate():
+    with pytest.raises(ValueError):
+        StreamingGrapher(aggregate='lttb')
@@ -0,0 +1,40 @@
+# Copyright 2017 LinkedIn Corporation. All rights reserved. Licensed under the BSD-2 Clause license.
+# See LICENSE in the project root for license information.
+import pytest
+
+from asciietch.graph import Grapher
+
+
+def make_values(size=1000):
+    return [(i * 7919) % 101 - 50 for i in range(size)]
+
+
+@pytest.mark.parametrize('method', ['asciigraph', 'asciihist', 'asciibraille'])
+@pytest.mark.parametrize('label', [False, True])
+def test_template_matches_method(method, label):
+    g = Grapher()
+    template = g.compile(max_width=60, max_height=10, label=label, method=method, aggregate='max')
+    options = {} if method == 'asciihist' else {'max_height': 10}
+    timeseries = {1500000000 + 60 * i: value for i, value in enumerate(make_values(500))}
+    for values in (make_values(), make_values(30), timeseries, [1, 1, 1]):
+        assert template(values) == getattr(g, method)(values, max_width=60, label=label, aggregate='max', **options)
+    # Canvases are reused between renders of the same size
+    assert template(make_values()) == template(make_values())
+
+
+def test_template_time_window():
+    g = Grapher()
+    timeseries = {1500000000 + 60 * i: value for i, value in enumerate(make_values(500))}
+    template = g.compile(max_width=40, label=True, gaps='blank')
+    start, end = 1500000000, 1500000000 + 60 * 1000
+    assert template(timeseries, start=start, end=end) == g.asciigraph(timeseries, max_width=40, label=True, gaps='blank', start=start, end=end)
+
+
+def test_template_errors():
+    g = Grapher()
+    with pytest.raises(ValueError):
+        g.compile(method='asciidist')
+    with pytest.raises(ValueError):
+        g.compile(aggregate='median')
+    with pytest.raises(ValueError):
+        g.compile()([[1, 2], [3, 4]])